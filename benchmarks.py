@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Micro benchmarks, run as `python benchmarks.py [name ...]`."""
+
+import os
+import sys
+import json
+import timeit
+import tempfile
+import jsonobjects as jo
+from jsonobjects.schema import walk_fields
+
+
+class iTunesAppSchema(jo.Schema):
+    id = jo.IntegerField('trackId')
+    url = jo.Field('trackViewUrl')
+    name = jo.StringField('trackName')
+    currency = jo.StringField()
+    price = jo.FloatField(min_value=0.0)
+    rating = jo.FloatField('averageUserRating')
+    reviews = jo.IntegerField('userRatingCountForCurrentVersion')
+    version = jo.StringField()
+    publisher_id = jo.IntegerField('artistId')
+    publisher_url = jo.Field('artistViewUrl')
+    publisher_name = jo.StringField('artistName')
+    categories = jo.ListField('genres', child=jo.StringField())
+    icon = jo.Field(
+        ['artworkUrl512', 'artworkUrl60'], post_process=lambda v: {'url': v})
+    screenshots = jo.ListField(
+        'screenshotUrls', child=jo.Field(post_process=lambda v: {'url': v}))
+
+
+def make_app(i=0):
+    return {
+        'trackId': 880047117 + i,
+        'trackViewUrl': 'https://itunes.apple.com/us/app/id880047117?mt=8',
+        'trackName': 'Angry Birds 2',
+        'currency': 'USD',
+        'price': 0.0,
+        'averageUserRating': 4.0,
+        'userRatingCountForCurrentVersion': 4796,
+        'version': '2.2.1',
+        'artistId': 298910979,
+        'artistViewUrl': 'https://itunes.apple.com/us/developer/id298910979',
+        'artistName': 'Rovio Entertainment Ltd',
+        'genres': ['Games', 'Puzzle', 'Action'],
+        'artworkUrl60': 'http://is3.mzstatic.com/image/60x60bb.jpg',
+        'screenshotUrls': [
+            'http://a4.mzstatic.com/us/r30/screen{0}.jpeg'.format(n)
+            for n in range(5)
+        ],
+    }
+
+
+def make_wide_app(i=0):
+    app = make_app(i)
+    app.update({
+        'description': 'Angry Birds 2 is here!\n' * 100,
+        'releaseNotes': 'Bug fixes and improvements.\n' * 10,
+        'supportedDevices': ['iPhone{0}-iPhone{0}'.format(n)
+                             for n in range(100)],
+        'languageCodesISO2A': ['EN', 'FR', 'DE', 'JA'] * 10,
+        'ipadScreenshotUrls': [
+            'http://a4.mzstatic.com/us/r30/ipad{0}.jpeg'.format(n)
+            for n in range(5)
+        ],
+        'advisories': ['Infrequent/Mild Cartoon or Fantasy Violence'],
+        'features': ['gameCenter', 'iosUniversal'],
+        'fileSizeBytes': '105318400',
+        'sellerName': 'Rovio Entertainment Ltd',
+        'minimumOsVersion': '7.0',
+        'contentAdvisoryRating': '9+',
+    })
+    return app
+
+
+ITUNES_RESPONSE = json.loads(
+    json.dumps({'resultCount': 1, 'results': [make_app()]}))
+
+
+def report(name, seconds, number):
+    print('{name:<40} {usec:10.2f} usec/loop'.format(
+        name=name, usec=seconds / number * 1e6))
+
+
+def bench_compile(number=20000):
+    parser = iTunesAppSchema('results.0')
+    compiled = parser.compile()
+    assert compiled(ITUNES_RESPONSE) == parser(ITUNES_RESPONSE)
+    report('Schema.parse',
+           timeit.timeit(lambda: parser(ITUNES_RESPONSE), number=number),
+           number)
+    report('Schema.compile()',
+           timeit.timeit(lambda: compiled(ITUNES_RESPONSE), number=number),
+           number)
+
+
+def bench_parse_many(number=20, size=1000):
+    parser = iTunesAppSchema()
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+
+    def loop():
+        return [parser.parse(app) for app in apps]
+
+    assert parser.parse_many(apps) == loop()
+    report('[Schema.parse(...) for ...] x{size}'.format(size=size),
+           timeit.timeit(loop, number=number), number)
+    report('Schema.parse_many() x{size}'.format(size=size),
+           timeit.timeit(lambda: parser.parse_many(apps), number=number),
+           number)
+
+
+def bench_parse_json(number=200):
+    parser = iTunesAppSchema('results.0')
+    app = make_wide_app()
+    app['userReviews'] = [
+        {'id': n, 'title': 'Great', 'body': 'I love it. ' * 20, 'rating': 5}
+        for n in range(200)
+    ]
+    data = json.dumps({'resultCount': 1, 'results': [app]})
+    assert parser.parse_json(data, project=True) == parser.parse_json(data)
+    report('Schema.parse_json()',
+           timeit.timeit(lambda: parser.parse_json(data), number=number),
+           number)
+    report('Schema.parse_json(project=True)',
+           timeit.timeit(lambda: parser.parse_json(data, project=True),
+                         number=number),
+           number)
+
+
+def bench_parse_columns(number=20, size=1000):
+    parser = iTunesAppSchema()
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    report('Schema.parse_many() x{size}'.format(size=size),
+           timeit.timeit(lambda: parser.parse_many(apps), number=number),
+           number)
+    report('Schema.parse_columns() x{size}'.format(size=size),
+           timeit.timeit(lambda: parser.parse_columns(apps), number=number),
+           number)
+
+
+def bench_numeric_array(number=5, size=100000):
+    series = [i * 0.25 for i in range(size)]
+    data = {'series': series}
+
+    class ListSchema(jo.Schema):
+        series = jo.ListField(child=jo.FloatField(min_value=0, precision=2))
+
+    class ArraySchema(jo.Schema):
+        series = jo.NumericArrayField(min_value=0, precision=2)
+
+    list_parser = ListSchema()
+    array_parser = ArraySchema()
+    assert array_parser.parse(data)['series'].tolist() == series
+    report('ListField(child=FloatField()) x{size}'.format(size=size),
+           timeit.timeit(lambda: list_parser.parse(data), number=number),
+           number)
+    report('NumericArrayField() x{size}'.format(size=size),
+           timeit.timeit(lambda: array_parser.parse(data), number=number),
+           number)
+
+
+def bench_records(number=20, size=1000):
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    for record in [False, True]:
+        parser = iTunesAppSchema(record=record)
+        results = parser.parse_many(apps)
+        report('Schema(record={record}).parse_many() x{size}'.format(
+               record=record, size=size),
+               timeit.timeit(lambda: parser.parse_many(apps), number=number),
+               number)
+        print('{name:<40} {size:10d} bytes'.format(
+              name='  sys.getsizeof(result)', size=sys.getsizeof(results[0])))
+
+
+def bench_lazy(number=20, size=1000):
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    for lazy in [False, True]:
+        parser = iTunesAppSchema(lazy=lazy)
+
+        def loop():
+            for app in parser.parse_many(apps):
+                app['id'], app['name'], app['price']
+
+        report('Schema(lazy={lazy}), 3 fields used x{size}'.format(
+               lazy=lazy, size=size),
+               timeit.timeit(loop, number=number), number)
+
+
+def bench_instantiation(number=2000):
+    class Leaf(jo.Schema):
+        a = jo.IntegerField(min_value=0)
+        b = jo.RegexField(regex=r'^\w+$')
+        c = jo.StringField(max_length=10)
+
+    class Middle(jo.Schema):
+        leaf = Leaf()
+        leaves = jo.ListField(child=Leaf())
+        x = jo.FloatField()
+
+    class Top(jo.Schema):
+        middle = Middle()
+        middles = jo.ListField(child=Middle())
+        name = jo.StringField()
+
+    def instantiate():
+        # Bind fields of all the nested schemas
+        return list(walk_fields(Top('results.0')))
+
+    report('Top(...) with 3 levels of nested schemas',
+           timeit.timeit(instantiate, number=number), number)
+
+
+def bench_shared_prefixes(number=20, size=1000):
+    # Plain fields, so lookups dominate
+    class PublisherSchema(jo.Schema):
+        id = jo.Field('results.0.meta.publisher.id')
+        name = jo.Field('results.0.meta.publisher.name')
+        url = jo.Field('results.0.meta.publisher.url')
+        country = jo.Field('results.0.meta.publisher.country')
+        rating = jo.Field(['results.0.meta.publisher.rating',
+                           'results.0.meta.rating'])
+        apps = jo.Field('results.0.meta.publisher.stats.apps')
+        downloads = jo.Field('results.0.meta.publisher.stats.total')
+
+    publisher = {'id': 1, 'name': 'Rovio', 'url': 'http://rovio.com',
+                 'country': 'FI', 'stats': {'apps': 10, 'total': 1000}}
+    docs = [{'results': [{'meta': {'publisher': dict(publisher, id=i),
+                                   'rating': 4.5}}]}
+            for i in range(size)]
+    parser = PublisherSchema()
+    report('7 fields with a shared prefix x{size}'.format(size=size),
+           timeit.timeit(lambda: parser.parse_many(docs), number=number),
+           number)
+
+
+def bench_missing_fields(number=20, size=1000):
+    # Optional fields with fallback sources, 70% of values are missing
+    names = ['field{n}'.format(n=n) for n in range(10)]
+    SparseSchema = type('SparseSchema', (jo.Schema,), dict(
+        (name, jo.Field(['meta.' + name, 'extra.' + name, name],
+                        required=False, default=None))
+        for name in names))
+
+    docs = [dict((name, i) for name in names[:3]) for i in range(size)]
+    parser = SparseSchema()
+    assert parser.parse_many(docs) == [parser.parse(d) for d in docs]
+    report('Schema.parse, 70% missing x{size}'.format(size=size),
+           timeit.timeit(lambda: [parser.parse(d) for d in docs],
+                         number=number),
+           number)
+    report('Schema.parse_many, 70% missing x{size}'.format(size=size),
+           timeit.timeit(lambda: parser.parse_many(docs), number=number),
+           number)
+
+
+def bench_adaptive_sources(number=20, size=1000):
+    # The last source is found in most documents of a heterogeneous feed
+    sources = ['artwork.large', 'artwork.medium', 'artworkUrl512',
+               'artworkUrl100', 'artworkUrl60']
+    docs = [{'artworkUrl60': i} if i % 10 else {'artworkUrl512': i}
+            for i in range(size)]
+    for dialect in ['default', 'jmespath']:
+        for adaptive in [False, True]:
+            class IconSchema(jo.Schema):
+                icon = jo.Field(sources, dialect=dialect, adaptive=adaptive)
+
+            parser = IconSchema()
+            parser.parse_many(docs)
+            name = ' {dialect} adaptive={adaptive}'.format(
+                dialect=dialect, adaptive=adaptive)
+            report('parse' + name,
+                   timeit.timeit(lambda: [parser.parse(d) for d in docs],
+                                 number=number),
+                   number)
+            report('parse_many' + name,
+                   timeit.timeit(lambda: parser.parse_many(docs),
+                                 number=number),
+                   number)
+
+
+def bench_dates(number=10, size=1000):
+    values = ['2015-03-{day:02d}T12:{minute:02d}:00+05:30'.format(
+              day=i % 28 + 1, minute=i % 60) for i in range(size)]
+    local = ['{day:02d}.03.2015'.format(day=i % 28 + 1) for i in range(size)]
+    for name, field, docs in [
+            ('ISO-8601', jo.DateTimeField('x'), values),
+            ('2nd of 3 formats', jo.DateField(
+                'x', formats=['%Y-%m-%d', '%d.%m.%Y', '%m/%d/%Y'],
+                memoize_format=True), local)]:
+        docs = [{'x': v} for v in docs]
+        report('{cls_name}, {name} x{size}'.format(
+               cls_name=field.__class__.__name__, name=name, size=size),
+               timeit.timeit(lambda: [field(d) for d in docs], number=number),
+               number)
+
+
+def bench_cached_conversions(number=20, size=1000):
+    apps = json.loads(json.dumps([
+        dict(make_app(i), releaseDate='2015-07-{day:02d}T07:00:00Z'.format(
+             day=i % 28 + 1), formattedPrice='Free')
+        for i in range(size)]))
+    for cache_size in [None, 256]:
+        class CatalogSchema(jo.Schema):
+            name = jo.StringField('trackName', cache_size=cache_size)
+            currency = jo.StringField(cache_size=cache_size)
+            version = jo.StringField(cache_size=cache_size)
+            price = jo.DecimalField(cache_size=cache_size)
+            formatted_price = jo.StringField('formattedPrice',
+                                             cache_size=cache_size)
+            publisher = jo.StringField('artistName', cache_size=cache_size)
+            categories = jo.ListField('genres', child=jo.StringField(
+                cache_size=cache_size))
+            released = jo.DateTimeField('releaseDate', cache_size=cache_size)
+
+        parser = CatalogSchema()
+        parser.parse_many(apps)
+        report('parse_many, cache_size={cache_size} x{size}'.format(
+               cache_size=cache_size, size=size),
+               timeit.timeit(lambda: parser.parse_many(apps), number=number),
+               number)
+        results = parser.parse_many(apps)
+        values = [v for r in results for v in r.values()] + \
+            [v for r in results for v in r['categories']]
+        print('{name:<40} {size:10d} bytes'.format(
+              name='  distinct values', size=sum(
+                  sys.getsizeof(v) for v in
+                  dict((id(v), v) for v in values).values())))
+
+
+def bench_rejected(number=20, size=1000):
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    rejected = [dict(app, trackId='n/a', price='free', version=None,
+                     averageUserRating='-', genres='Games')
+                for app in apps]
+    for kwargs in [{}, {'fail_fast': True}]:
+        parser = iTunesAppSchema(**kwargs)
+        for name, docs in [('accepted', apps), ('rejected', rejected)]:
+            report('parse_many({kwargs}), {name} x{size}'.format(
+                   kwargs=', '.join('{0}={1}'.format(*kv)
+                                    for kv in kwargs.items()),
+                   name=name, size=size),
+                   timeit.timeit(lambda: parser.parse_many(
+                       docs, on_error='skip'), number=number),
+                   number)
+
+
+def bench_trusted(number=20, size=1000):
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    for kwargs in [{}, {'trusted': True},
+                   {'trusted': True, 'validate_fraction': 0.01}]:
+        parser = iTunesAppSchema(**kwargs)
+        report('parse_many({kwargs}) x{size}'.format(
+               kwargs=', '.join('{0}={1}'.format(*kv)
+                                for kv in sorted(kwargs.items())),
+               size=size),
+               timeit.timeit(lambda: parser.parse_many(apps), number=number),
+               number)
+
+
+def bench_parse_many_workers(number=3, size=20000):
+    parser = iTunesAppSchema()
+    apps = json.loads(json.dumps([make_app(i) for i in range(size)]))
+    expected = parser.parse_many(apps)
+    for workers in [1, 2, 4, 8, 16]:
+        pool = parser.create_pool(workers)
+        try:
+            assert parser.parse_many(apps, executor=pool) == expected
+            report('Schema.parse_many(workers={workers}) x{size}'.format(
+                   workers=workers, size=size),
+                   timeit.timeit(
+                       lambda: parser.parse_many(apps, executor=pool,
+                                                 chunk_size=500),
+                       number=number),
+                   number)
+        finally:
+            pool.terminate()
+
+
+def bench_parse_shards(number=3, size=20000):
+    parser = iTunesAppSchema()
+    fd, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for i in range(size):
+                f.write(json.dumps(make_app(i)) + '\n')
+
+        def lines():
+            with open(path, 'rb') as f:
+                return list(parser.iter_parse_lines(f))
+
+        expected = lines()
+        report('Schema.iter_parse_lines() x{size}'.format(size=size),
+               timeit.timeit(lines, number=number), number)
+        for workers in [1, 2, 4, 8]:
+            assert parser.parse_shards(path, workers) == expected
+            report('Schema.parse_shards(workers={workers}) x{size}'.format(
+                   workers=workers, size=size),
+                   timeit.timeit(lambda: parser.parse_shards(path, workers),
+                                 number=number),
+                   number)
+    finally:
+        os.remove(path)
+
+
+BENCHMARKS = {
+    'compile': bench_compile,
+    'parse_many': bench_parse_many,
+    'parse_columns': bench_parse_columns,
+    'numeric_array': bench_numeric_array,
+    'records': bench_records,
+    'lazy': bench_lazy,
+    'instantiation': bench_instantiation,
+    'shared_prefixes': bench_shared_prefixes,
+    'missing_fields': bench_missing_fields,
+    'adaptive_sources': bench_adaptive_sources,
+    'dates': bench_dates,
+    'cached_conversions': bench_cached_conversions,
+    'rejected': bench_rejected,
+    'trusted': bench_trusted,
+    'parse_json': bench_parse_json,
+    'parse_many_workers': bench_parse_many_workers,
+    'parse_shards': bench_parse_shards,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or sorted(BENCHMARKS):
+        print('# {name}'.format(name=name))
+        BENCHMARKS[name]()
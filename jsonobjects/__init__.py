@@ -4,11 +4,13 @@
 from .exceptions import GenericError, NotFound, ValidationError
 from .fields import (
     Field, BooleanField, StringField, IntegerField, FloatField, DecimalField,
-    DateField, DateTimeField, TimeField, RegexField, ListField, DictField
+    DateField, DateTimeField, TimeField, RegexField, ListField, DictField,
+    NumericArrayField
 )
 from .validators import (
     MinValue, MaxValue, MinLength, MaxLength, RegexValidator, ChoiceValidator
 )
+from .records import Record, LazyRecord
 from .schema import Schema
 from . import path
 from .path import Path
@@ -19,9 +21,11 @@ __version__ = '1.0.3'
 
 
 __all__ = ['GenericError', 'NotFound', 'ValidationError',
-           'path', 'Path', 'Schema', 'NULL', 'ISO_8601',
+           'path', 'Path', 'Schema', 'Record', 'LazyRecord', 'NULL',
+           'ISO_8601',
            'Field', 'BooleanField', 'StringField', 'IntegerField',
            'FloatField', 'DecimalField', 'DateField', 'DateTimeField',
            'TimeField', 'RegexField', 'ListField', 'DictField',
+           'NumericArrayField',
            'MinValue', 'MaxValue', 'MinLength', 'MaxLength', 'RegexValidator',
            'ChoiceValidator']
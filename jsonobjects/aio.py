@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Asyncio support, requires Python 3.6+ and is imported by `Schema` only
+when it is used.
+"""
+
+import asyncio
+import inspect
+import multiprocessing.pool
+from collections.abc import Mapping
+from functools import wraps
+from .decoders import INVALID_JSON, get_decoder
+from .exceptions import ValidationError
+from .fields import ListField, DictField, _is_base
+from .parallel import parse_document
+from .schema import Schema
+from .utils import NULL, is_non_str_iterable, to_unicode
+
+
+__all__ = ['run_in_executor', 'run_validation', 'aparse', 'aiter_parse_lines',
+           'as_decorator']
+
+
+def _resolve(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _reject(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+
+def run_in_executor(executor, func, *args):
+    """Runs `func` in the `executor`: `concurrent.futures.Executor` or
+    `multiprocessing.Pool` created by `Schema.create_pool`, in which case
+    `func` should be a module level function.
+    """
+    loop = asyncio.get_event_loop()
+    if not isinstance(executor, multiprocessing.pool.Pool):
+        return loop.run_in_executor(executor, func, *args)
+
+    future = loop.create_future()
+    executor.apply_async(
+        func, args,
+        callback=lambda r: loop.call_soon_threadsafe(_resolve, future, r),
+        error_callback=lambda e: loop.call_soon_threadsafe(_reject, future, e))
+    return future
+
+
+class _Unlimited(object):
+
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+def _limiter(concurrency):
+    return asyncio.Semaphore(concurrency) if concurrency else _Unlimited()
+
+
+async def _call(hook, value, limiter):
+    result = hook(value)
+    if inspect.isawaitable(result):
+        async with limiter:
+            result = await result
+    return result
+
+
+async def _gather(coros):
+    # Let all the hooks finish and raise the first error in order
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+async def run_validation(field, value, limiter):
+    """Same as `field.run_validation`, but awaits results of coroutine
+    validators, post processors and `validate_<name>` methods. Hooks of
+    different fields and items of lists are run concurrently, at most as
+    many at once as the `limiter` (`asyncio.Semaphore`) allows.
+
+    Stages overridden by fields are called as is.
+    """
+    if not _is_base(field, 'run_validation'):
+        return field.run_validation(value)
+
+    is_empty, value = field.validate_empty_values(value)
+    if is_empty:
+        return value
+
+    value = await convert_to_type(field, value, limiter)
+    if _is_base(field, 'run_validators'):
+        # Validators are independent of each other
+        await _gather([_call(validate, value, limiter)
+                       for validate in field.validators])
+    else:
+        field.run_validators(value)
+    value = field.validate(value)
+    if _is_base(field, 'run_post_process'):
+        for process in field.post_process:
+            value = await _call(process, value, limiter)
+    else:
+        value = field.run_post_process(value)
+    return value
+
+
+async def convert_to_type(field, value, limiter):
+    if isinstance(field, Schema) and \
+            _is_base(field, 'convert_to_type', Schema):
+        return await convert_schema(field, value, limiter)
+
+    # Invalid values are reported by `convert_to_type` of the field
+    if isinstance(field, ListField) and \
+            _is_base(field, 'convert_to_type', ListField) and \
+            is_non_str_iterable(value):
+        return await _gather([run_validation(field.child, v, limiter)
+                              for v in value])
+
+    if isinstance(field, DictField) and \
+            _is_base(field, 'convert_to_type', DictField) and \
+            isinstance(value, Mapping):
+        keys = [to_unicode(k) for k in value]
+        values = await _gather([run_validation(field.child, value[k], limiter)
+                                for k in value])
+        return dict(zip(keys, values))
+
+    return field.convert_to_type(value)
+
+
+async def _run_field(schema, field, data, limiter):
+    value = await run_validation(field, field.find(data), limiter)
+    hook = getattr(schema, 'validate_' + field.field_name, None)
+    if hook is not None:
+        value = await _call(hook, value, limiter)
+    return value
+
+
+async def convert_schema(schema, value, limiter):
+    """Same as `Schema.convert_to_type`, but fields are run concurrently."""
+    fields = list(schema.fields.values())
+    results = await asyncio.gather(
+        *[_run_field(schema, field, value, limiter) for field in fields],
+        return_exceptions=True)
+
+    result = {}
+    errors = []
+    for field, value in zip(fields, results):
+        if isinstance(value, ValidationError):
+            errors.append(value.with_field_name(field.field_name))
+        elif isinstance(value, BaseException):
+            raise value
+        else:
+            result[field.field_name] = value
+
+    if errors:
+        # Fields are run concurrently, so only the reported errors are limited
+        raise ValidationError(errors[:schema.errors_limit], schema.field_name)
+
+    if schema.is_record:
+        result = schema.record_class(**result)
+
+    if schema.result_factory is not NULL:
+        result = schema.result_factory(result)
+
+    return result
+
+
+async def aparse(schema, data, executor=None, concurrency=None):
+    """Parses `data` with the `schema`, in the `executor` if it is given so
+    the event loop is not blocked by large documents. Schemas with
+    coroutine hooks are run in the event loop with at most `concurrency`
+    hooks awaited at once.
+    """
+    if schema.is_async:
+        assert executor is None, (
+            '`executor` is not supported by schemas with coroutine hooks.'
+        )
+        return await run_validation(schema, schema.find(data),
+                                    _limiter(concurrency))
+    if executor is None:
+        return schema.parse(data)
+    if isinstance(executor, multiprocessing.pool.Pool):
+        return await run_in_executor(executor, parse_document, data)
+    return await run_in_executor(executor, schema.parse, data)
+
+
+async def _readline(reader):
+    """Same as `reader.readline()`, but lines longer than the limit of the
+    reader are read by parts instead of raising `ValueError`.
+    """
+    parts = []
+    while True:
+        try:
+            parts.append(await reader.readuntil(b'\n'))
+        except asyncio.IncompleteReadError as e:
+            parts.append(e.partial)
+        except asyncio.LimitOverrunError as e:
+            parts.append(await reader.readexactly(e.consumed))
+            continue
+        return b''.join(parts)
+
+
+async def aiter_parse_lines(schema, reader, on_error='raise', decoder=None,
+                            use_decimal=None, concurrency=None):
+    """Parses newline delimited JSON documents read from `reader`, see
+    `Schema.aiter_parse_lines`.
+    """
+    if use_decimal is None:
+        use_decimal = schema.use_decimal
+    loads = get_decoder(decoder, use_decimal).loads
+    limiter = _limiter(concurrency)
+
+    index = offset = lineno = 0
+    while True:
+        # The reader stops reading from the transport while its buffer is
+        # full, so slow consumers don't make documents pile up in memory
+        line = await _readline(reader)
+        if not line:
+            return
+        lineno += 1
+        start, offset = offset, offset + len(line)
+        if not line.strip():
+            continue
+
+        try:
+            try:
+                data = loads(line, use_decimal)
+            except ValueError as e:
+                raise ValidationError(INVALID_JSON.format(error=e))
+            if schema.is_async:
+                result = await run_validation(schema, schema.find(data),
+                                              limiter)
+            else:
+                result = schema.compiled(data)
+        except ValidationError as e:
+            e.index, e.line, e.offset = index, lineno, start
+            if on_error == 'raise':
+                raise
+            if on_error == 'collect':
+                yield e
+        else:
+            yield result
+        index += 1
+
+
+def as_decorator(schema, func):
+    """Async version of `Schema.as_decorator` for coroutine functions."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await aparse(schema, await func(*args, **kwargs))
+    return wrapper
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import array
+from .fields import BooleanField, IntegerField, FloatField
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = ['Column', 'Columns', 'column_typecode']
+
+
+def _int_typecode():
+    # 'q' is not supported before Python 3.3
+    try:
+        array.array('q')
+        return 'q'
+    except ValueError:
+        return 'l'
+
+
+_INT_TYPECODE = _int_typecode()
+
+_NUMPY_DTYPES = {'b': 'bool', 'd': 'float64', 'l': 'int64', 'q': 'int64'}
+
+
+def column_typecode(field):
+    """Returns `array` typecode of values of the `field` or `None` if they
+    are stored in a `list`.
+    """
+    if isinstance(field, BooleanField):
+        return 'b'
+    if isinstance(field, IntegerField):
+        return _INT_TYPECODE
+    if isinstance(field, FloatField):
+        return 'd'
+    return None
+
+
+class Column(object):
+    """Values of the field of all parsed documents.
+
+    Values are stored in an `array.array` of `typecode` (falling back to a
+    `list` when a value doesn't fit it) or a `list`. `None` values are
+    stored as zeros with unset bits of the `validity` bitmap, where the bit
+    `i % 8` of the byte `i // 8` is set for valid values.
+    """
+
+    def __init__(self, name, typecode=None):
+        self.name = name
+        self.typecode = typecode
+        self.values = array.array(typecode) if typecode else []
+        self.validity = bytearray()
+        self.null_count = 0
+
+    def append(self, value):
+        n = len(self.values)
+        if not n % 8:
+            self.validity.append(0)
+
+        if value is None:
+            self.null_count += 1
+            if self.typecode:
+                value = 0
+        else:
+            self.validity[n >> 3] |= 1 << (n & 7)
+
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            # E.g. post processors changed type of values
+            self.typecode = None
+            self.values = list(self.values)
+            self.values.append(value)
+
+    def extend(self, values):
+        """Appends the sequence of `values` in bulk if it can."""
+        n = len(self.values)
+        # `in` would compare values, which is ambiguous for NumPy arrays
+        if n % 8 or any(v is None for v in values):
+            for value in values:
+                self.append(value)
+            return
+
+        if self.typecode:
+            try:
+                values = array.array(self.typecode, values)
+            except (TypeError, OverflowError):
+                for value in values:
+                    self.append(value)
+                return
+        self.values.extend(values)
+
+        full, rest = divmod(len(values), 8)
+        self.validity.extend(b'\xff' * full)
+        if rest:
+            self.validity.append((1 << rest) - 1)
+
+    def is_valid(self, index):
+        if index < 0:
+            index += len(self.values)
+        return bool(self.validity[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if not self.is_valid(index):
+            return None
+        value = self.values[index]
+        return bool(value) if self.typecode == 'b' else value
+
+    def __iter__(self):
+        for i in range(len(self.values)):
+            yield self[i]
+
+    def to_list(self):
+        return list(self)
+
+    def to_numpy(self):
+        """Returns `numpy.ndarray` of the values, `numpy.ma.MaskedArray`
+        if there are `None` values.
+        """
+        assert numpy, (
+            '`numpy` is not installed. Use `pip install numpy` command to '
+            'install this package.'
+        )
+        if self.typecode:
+            values = numpy.frombuffer(self.values, self.typecode)
+            values = values.astype(_NUMPY_DTYPES[self.typecode])
+        else:
+            values = numpy.empty(len(self.values), dtype=object)
+            # Assigned one by one, so NumPy doesn't broadcast array values
+            for i, value in enumerate(self.values):
+                values[i] = value
+        if not self.null_count:
+            return values
+        validity = numpy.frombuffer(bytes(self.validity), numpy.uint8)
+        bits = (validity[:, None] >> numpy.arange(8, dtype=numpy.uint8)) & 1
+        mask = bits.ravel()[:len(self.values)] == 0
+        return numpy.ma.masked_array(values, mask=mask)
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({name!r}, {size})'.format(
+            cls_name=cls_name, name=self.name, size=len(self.values))
+
+
+class Columns(object):
+    """Columns of parsed documents by field names."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._by_name = dict((c.name, c) for c in columns)
+
+    @property
+    def names(self):
+        return [c.name for c in self.columns]
+
+    def append(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+
+    def extend(self, rows):
+        for column, values in zip(self.columns, zip(*rows)):
+            column.extend(values)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def rows(self):
+        """Yields documents back as `dict`s."""
+        names = self.names
+        for row in zip(*self.columns):
+            yield dict(zip(names, row))
+
+    def to_numpy(self):
+        """Returns a `dict` of field names to `Column.to_numpy` arrays."""
+        return dict((c.name, c.to_numpy()) for c in self.columns)
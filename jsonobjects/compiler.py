@@ -0,0 +1,671 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import random
+import decimal
+import datetime
+from collections import Mapping, namedtuple
+from .exceptions import ValidationError
+from .fields import (
+    Field, BooleanField, StringField, BaseNumberField, IntegerField,
+    FloatField, DecimalField, DateField, DateTimeField, TimeField, ListField,
+    DictField, _func, _is_base
+)
+from .path import Path, _step_key, _step_index, _step_any
+from .records import LazyRecord
+from .schema import Schema
+from .utils import NULL, is_non_str_iterable, to_unicode, unicode_type
+
+
+__all__ = ['compile_schema', 'compile_row', 'compile_fields', 'TrustInfo',
+           'SampledParser']
+
+
+def _uses_getters(field):
+    """Whether the `field` is found by its `_getters`."""
+    if isinstance(field, Schema):
+        return _is_base(field, 'find', Schema) and bool(field.source)
+    return _is_base(field, 'find')
+
+
+def _path_of(get):
+    """Returns `Path` of the getter if its lookup can be inlined."""
+    compiled = getattr(get, '__self__', None)
+    if type(compiled) is Path and \
+            getattr(get, '__func__', None) is _func(Path, 'get'):
+        return compiled
+    return None
+
+
+def _start(steps, data, prefixes, max_length):
+    """Returns variable of the longest resolved prefix of the `steps` (at
+    most `max_length` steps long) or `data` and the rest of steps.
+    """
+    if prefixes:
+        for n in range(max_length, 0, -1):
+            if steps[:n] in prefixes:
+                return prefixes[steps[:n]], steps[n:]
+    return data, steps
+
+
+class _Builder(object):
+    """Generates source code of a specialized parser for a bound `Schema`.
+
+    Every stage of `Field.run_validation` which is not overridden is inlined
+    (or dropped when it is a no-op), paths of the default dialect are
+    unrolled into plain lookups and everything else is called through
+    references bound into the namespace of the generated code.
+
+    Parsers of `trusted` input return values of the exact field types as is
+    and skip validators of all fields.
+    """
+
+    def __init__(self, trusted=False):
+        self.trusted = trusted
+        self.lines = []
+        self.namespace = {
+            'NULL': NULL,
+            'ValidationError': ValidationError,
+            'Mapping': Mapping,
+            'is_non_str_iterable': is_non_str_iterable,
+            'to_unicode': to_unicode,
+            'unicode_type': unicode_type,
+            'step_key': _step_key,
+            'step_index': _step_index,
+            'step_any': _step_any,
+            'LazyRecord': LazyRecord,
+            'Decimal': decimal.Decimal,
+            'datetime': datetime.datetime,
+            'date': datetime.date,
+            'time': datetime.time,
+        }
+        self.counter = 0
+        self.schemas = {}
+        self.runners = {}
+
+    def ref(self, obj, prefix='r'):
+        self.counter += 1
+        name = '{prefix}{n}'.format(prefix=prefix, n=self.counter)
+        self.namespace[name] = obj
+        return name
+
+    def emit(self, lines, indent, line):
+        lines.append('    ' * indent + line)
+
+    # Lookups
+
+    def emit_steps(self, lines, indent, steps, data, out, allow_null=True,
+                   nullable=False):
+        """Emits lookup of the `steps` from the `data` variable, which may
+        be `NULL` if it is `nullable` (e.g. an unresolved prefix).
+        """
+        emit = self.emit
+        emit(lines, indent, 'while 1:')
+        indent += 1
+        emit(lines, indent, 'd = {data}'.format(data=data))
+        if nullable:
+            emit(lines, indent, 'if d is NULL:')
+            emit(lines, indent + 1, 'break')
+        for evaluate, k in steps:
+            if evaluate is _step_key:
+                emit(lines, indent, 'if type(d) is dict:')
+                emit(lines, indent + 1, 'd = d.get({k!r}, NULL)'.format(k=k))
+                emit(lines, indent, 'else:')
+                emit(lines, indent + 1, 'd = step_key({k!r}, d)'.format(k=k))
+            elif evaluate is _step_index:
+                if k >= 0:
+                    check = 'len(d) > {k!r}'.format(k=k)
+                else:
+                    check = 'len(d) >= {k!r}'.format(k=-k)
+                emit(lines, indent, 'if type(d) is list:')
+                emit(lines, indent + 1, 'd = d[{k!r}] if {check} else NULL'
+                     .format(k=k, check=check))
+                emit(lines, indent, 'else:')
+                emit(lines, indent + 1, 'd = step_index({k!r}, d)'.format(k=k))
+            else:
+                emit(lines, indent, 'd = step_any(None, d)')
+            emit(lines, indent, 'if d is NULL:')
+            emit(lines, indent + 1, 'break')
+        if not allow_null:
+            emit(lines, indent, 'if d is None:')
+            emit(lines, indent + 1, 'break')
+        emit(lines, indent, '{out} = d'.format(out=out))
+        emit(lines, indent, 'break')
+
+    def emit_path(self, lines, indent, compiled, data, out, prefixes=None):
+        """Emits lookup of the `compiled` path starting from the longest
+        prefix of its steps resolved by `emit_prefixes`.
+        """
+        start, steps = _start(compiled.steps, data, prefixes,
+                              len(compiled.steps))
+        self.emit_steps(lines, indent, steps, start, out, compiled.allow_null,
+                        nullable=start != data)
+
+    def emit_prefixes(self, lines, indent, paths, data):
+        """Emits lookups of prefixes shared by the `paths` (tuples of steps)
+        once per document, returns `dict` of prefixes to their variables.
+        Steps of missing prefixes evaluate to `NULL`.
+        """
+        counts = {}
+        for steps in set(paths):
+            for n in range(1, len(steps) + 1):
+                counts[steps[:n]] = counts.get(steps[:n], 0) + 1
+
+        # Prefix is not needed if a longer one is shared by the same paths
+        extended = {}
+        for prefix, count in counts.items():
+            parent = prefix[:-1]
+            extended[parent] = max(extended.get(parent, 0), count)
+        shared = sorted([prefix for prefix, count in counts.items()
+                         if count > 1 and extended.get(prefix, 0) < count],
+                        key=len)
+
+        prefixes = {}
+        for prefix in shared:
+            start, steps = _start(prefix, data, prefixes, len(prefix) - 1)
+            self.counter += 1
+            out = prefixes[prefix] = 'prefix{n}'.format(n=self.counter)
+            self.emit(lines, indent, '{out} = NULL'.format(out=out))
+            self.emit_steps(lines, indent, steps, start, out,
+                            nullable=start != data)
+        return prefixes
+
+    def emit_find(self, lines, indent, field, data, out, prefixes=None):
+        emit = self.emit
+
+        if isinstance(field, Schema) and _is_base(field, 'find', Schema):
+            if not field.source:
+                emit(lines, indent, '{out} = {data}'.format(out=out, data=data))
+                return
+        if not _uses_getters(field):
+            find = self.ref(field.find, 'find')
+            emit(lines, indent, '{out} = {find}({data})'.format(
+                out=out, find=find, data=data))
+            return
+
+        getters = field._getters
+        if getters is None:
+            getters = field._getters = field.compile_source(data)
+
+        if field.adaptive:
+            # Order of sources changes while parsing
+            stats = field.source_stats or field._create_source_stats()
+            emit(lines, indent, '{out} = {find}({getters}, {data})'.format(
+                out=out, find=self.ref(stats.find, 'find'),
+                getters=self.ref(getters, 'getters'), data=data))
+            return
+
+        emit(lines, indent, '{out} = NULL'.format(out=out))
+        for i, get in enumerate(getters):
+            inner = indent
+            if i:
+                emit(lines, indent, 'if {out} is NULL:'.format(out=out))
+                inner += 1
+            compiled = _path_of(get)
+            if compiled is not None:
+                self.emit_path(lines, inner, compiled, data, out, prefixes)
+            else:
+                get = self.ref(get, 'get')
+                emit(lines, inner, '{out} = {get}({data})'.format(
+                    out=out, get=get, data=data))
+
+    # Validation
+
+    def emit_run(self, lines, indent, field, v):
+        """Emits `run_validation` of the `field` for the `v` variable."""
+        emit = self.emit
+
+        if not _is_base(field, 'run_validation'):
+            run = self.ref(field.run_validation, 'run')
+            emit(lines, indent, '{v} = {run}({v})'.format(v=v, run=run))
+            return
+
+        if not _is_base(field, 'validate_empty_values'):
+            check = self.ref(field.validate_empty_values, 'empty')
+            emit(lines, indent, 'is_empty, {v} = {check}({v})'.format(
+                v=v, check=check))
+            emit(lines, indent, 'if not is_empty:')
+            self.emit_convert(lines, indent + 1, field, v)
+            return
+
+        fail = self.ref(field.fail, 'fail')
+
+        fast_path = None
+        # Overridden `is_null` may treat values of any type as null
+        if _is_base(field, 'is_null'):
+            if self.trusted:
+                fast_path = self.trusted_path(field, v)
+            if fast_path is None:
+                fast_path = self.fast_path(field, v)
+        if fast_path is not None:
+            # Most of values are already of the right type and not empty
+            condition, conversion = fast_path
+            emit(lines, indent, 'if {condition}:'.format(condition=condition))
+            self.emit_convert(lines, indent + 1, field, v, conversion)
+            emit(lines, indent, 'elif {v} is NULL:'.format(v=v))
+        else:
+            emit(lines, indent, 'if {v} is NULL:'.format(v=v))
+        if field.required:
+            emit(lines, indent + 1, "{fail}('required')".format(fail=fail))
+        else:
+            default = self.ref(field.default, 'default')
+            if callable(field.default):
+                default += '()'
+            emit(lines, indent + 1, '{v} = {default}'.format(
+                v=v, default=default))
+
+        if _is_base(field, 'is_null'):
+            emit(lines, indent, 'elif {v} is None:'.format(v=v))
+        else:
+            is_null = self.ref(field.is_null, 'is_null')
+            emit(lines, indent, 'elif {is_null}({v}):'.format(
+                v=v, is_null=is_null))
+        if not field.null:
+            emit(lines, indent + 1, "{fail}('null')".format(fail=fail))
+        else:
+            emit(lines, indent + 1, '{v} = None'.format(v=v))
+
+        # `BooleanField` for example never treats values as blank
+        if not _is_base(field, 'is_blank', BooleanField):
+            is_blank = self.ref(field.is_blank, 'is_blank')
+            emit(lines, indent, 'elif {is_blank}({v}):'.format(
+                v=v, is_blank=is_blank))
+            if not field.blank:
+                emit(lines, indent + 1, "{fail}('blank')".format(fail=fail))
+            blank = field.default_blank_value
+            if blank is not NULL:
+                blank_ref = self.ref(blank, 'blank')
+                if callable(blank):
+                    blank_ref += '()'
+                emit(lines, indent + 1, '{v} = {blank}'.format(
+                    v=v, blank=blank_ref))
+            elif field.blank:
+                emit(lines, indent + 1, 'pass')
+
+        emit(lines, indent, 'else:')
+        self.emit_convert(lines, indent + 1, field, v)
+
+    def trusted_path(self, field, v):
+        """Returns `(condition, conversion)` code for trusted values of the
+        exact type of the `field`, which are not validated, or `None`. Values
+        are still normalized, e.g. floats are rounded to `precision` and
+        strings are trimmed by `fast_path`.
+        """
+        if isinstance(field, FloatField) and \
+                _is_base(field, 'convert_to_type', FloatField) and \
+                _is_base(field, 'is_blank') and field.precision:
+            return 'type({v}) is float'.format(v=v), [
+                '{v} = round({v}, {precision!r})'.format(
+                    v=v, precision=field.precision)]
+
+        # Classes, their `convert_to_type` and `is_blank` bases and types
+        exact_types = [
+            (BooleanField, BooleanField, BooleanField, 'bool'),
+            (FloatField, FloatField, Field, 'float'),
+            (DecimalField, BaseNumberField, Field, 'Decimal'),
+            (DateTimeField, DateTimeField, Field, 'datetime'),
+            (DateField, DateField, Field, 'date'),
+            (TimeField, TimeField, Field, 'time'),
+        ]
+        for cls, convert_base, blank_base, type_name in exact_types:
+            if isinstance(field, cls) and \
+                    _is_base(field, 'convert_to_type', convert_base) and \
+                    _is_base(field, 'is_blank', blank_base):
+                return 'type({v}) is {type_name}'.format(
+                    v=v, type_name=type_name), []
+        return None
+
+    def fast_path(self, field, v):
+        """Returns `(condition, conversion)` code for values which skip
+        empty values checks and convert trivially, or `None`.
+        """
+        if isinstance(field, StringField) and \
+                _is_base(field, 'is_blank', StringField) and \
+                _is_base(field, 'convert_to_type', StringField):
+            if field.trim_whitespace:
+                return ('type({v}) is unicode_type and {v}.strip()'.format(v=v),
+                        ['{v} = {v}.strip()'.format(v=v)])
+            return 'type({v}) is unicode_type and {v}'.format(v=v), []
+
+        if isinstance(field, BooleanField) and \
+                _is_base(field, 'is_blank', BooleanField) and \
+                _is_base(field, 'convert_to_type', BooleanField):
+            return 'type({v}) is bool'.format(v=v), []
+
+        if not _is_base(field, 'is_blank'):
+            return None
+
+        if isinstance(field, IntegerField) and \
+                _is_base(field, 'convert_to_type', BaseNumberField) and \
+                _is_base(field, 'number_type', IntegerField):
+            return 'type({v}) is int'.format(v=v), []
+
+        if isinstance(field, FloatField) and \
+                _is_base(field, 'convert_to_type', FloatField) and \
+                field.number_type is float:
+            conversion = ['{v} = float({v})'.format(v=v)]
+            if field.precision:
+                conversion.append('{v} = round({v}, {precision!r})'.format(
+                    v=v, precision=field.precision))
+            return ('type({v}) is float or type({v}) is int'.format(v=v),
+                    conversion)
+
+        if isinstance(field, Schema) and \
+                _is_base(field, 'convert_to_type', Schema):
+            parse = self.compile_schema(field)
+            return ('type({v}) is dict and {v}'.format(v=v),
+                    ['{v} = {parse}({v})'.format(v=v, parse=parse)])
+
+        if isinstance(field, ListField) and \
+                _is_base(field, 'convert_to_type', ListField):
+            child = self.compile_runner(field.child)
+            return ('type({v}) is list and {v}'.format(v=v),
+                    ['{v} = [{child}(x) for x in {v}]'.format(
+                        v=v, child=child)])
+
+        return None
+
+    def emit_conversion(self, lines, indent, field, v):
+        """Emits `convert_to_type` of the `field`."""
+        emit = self.emit
+
+        if isinstance(field, Schema) and \
+                _is_base(field, 'convert_to_type', Schema):
+            parse = self.compile_schema(field)
+            emit(lines, indent, '{v} = {parse}({v})'.format(v=v, parse=parse))
+        elif isinstance(field, ListField) and \
+                _is_base(field, 'convert_to_type', ListField):
+            fail = self.ref(field.fail, 'fail')
+            child = self.compile_runner(field.child)
+            emit(lines, indent, 'if not is_non_str_iterable({v}):'.format(v=v))
+            emit(lines, indent + 1,
+                 "{fail}('invalid_type', input_type=type({v}).__name__)"
+                 .format(fail=fail, v=v))
+            emit(lines, indent, '{v} = [{child}(x) for x in {v}]'.format(
+                v=v, child=child))
+        elif isinstance(field, DictField) and \
+                _is_base(field, 'convert_to_type', DictField):
+            fail = self.ref(field.fail, 'fail')
+            child = self.compile_runner(field.child)
+            emit(lines, indent, 'if not isinstance({v}, Mapping):'.format(v=v))
+            emit(lines, indent + 1,
+                 "{fail}('invalid_type', input_type=type({v}).__name__)"
+                 .format(fail=fail, v=v))
+            emit(lines, indent,
+                 '{v} = {{to_unicode(k): {child}(x) for k, x in {v}.items()}}'
+                 .format(v=v, child=child))
+        elif not _is_base(field, 'convert_to_type'):
+            convert = self.ref(field.convert_to_type, 'convert')
+            emit(lines, indent, '{v} = {convert}({v})'.format(
+                v=v, convert=convert))
+
+    def emit_convert(self, lines, indent, field, v, conversion=None):
+        """Emits everything after empty values validation. Pre-generated
+        `conversion` lines replace `convert_to_type` if given.
+        """
+        emit = self.emit
+
+        start = len(lines)
+        if field.conversions is not None and \
+                not (self.trusted and conversion is not None):
+            self.emit_cached(lines, indent, field, v)
+        else:
+            if conversion is None:
+                self.emit_conversion(lines, indent, field, v)
+            else:
+                for line in conversion:
+                    emit(lines, indent, line)
+            self.emit_validators(lines, indent, field, v)
+
+        if not _is_base(field, 'run_post_process'):
+            process = self.ref(field.run_post_process, 'post_process')
+            emit(lines, indent, '{v} = {process}({v})'.format(
+                v=v, process=process))
+        else:
+            for process in field.post_process:
+                process = self.ref(process, 'post_process')
+                emit(lines, indent, '{v} = {process}({v})'.format(
+                    v=v, process=process))
+
+        if len(lines) == start:
+            emit(lines, indent, 'pass')
+
+    def emit_validators(self, lines, indent, field, v):
+        """Emits `run_validators` and `validate` of the `field`."""
+        emit = self.emit
+
+        if self.trusted:
+            pass
+        elif not _is_base(field, 'run_validators'):
+            validate = self.ref(field.run_validators, 'validators')
+            emit(lines, indent, '{validate}({v})'.format(v=v, validate=validate))
+        else:
+            for validator in field.validators:
+                validate = self.ref(validator, 'validator')
+                emit(lines, indent, '{validate}({v})'.format(
+                    v=v, validate=validate))
+
+        if not _is_base(field, 'validate'):
+            validate = self.ref(field.validate, 'validate')
+            emit(lines, indent, '{v} = {validate}({v})'.format(
+                v=v, validate=validate))
+
+    def emit_cached(self, lines, indent, field, v):
+        """Emits `run_cached` of the `field`, which replaces conversion and
+        validation by lookups in the `conversions` cache.
+        """
+        cached = self.ref(field.run_cached, 'cached')
+        self.emit(lines, indent, '{v} = {cached}({v})'.format(
+            v=v, cached=cached))
+
+    # Functions
+
+    def compile_runner(self, field):
+        """Generates `run_validation` function for the child `field`."""
+        key = id(field)
+        if key not in self.runners:
+            name = self.runners[key] = self.ref(None, 'run_validation')
+            lines = ['def {name}(v):'.format(name=name)]
+            self.emit_run(lines, 1, field, 'v')
+            self.emit(lines, 1, 'return v')
+            self.lines.extend(lines + [''])
+        return self.runners[key]
+
+    def emit_fields(self, lines, indent, schema, targets):
+        """Emits validation of the `schema` fields from the `value` variable
+        into the `targets` expressions, one per field.
+        """
+        emit = self.emit
+        prefixes = self.emit_prefixes(lines, indent, [
+            path.steps for _, field in schema.fields.items()
+            if _uses_getters(field) and field._getters and not field.adaptive
+            for path in map(_path_of, field._getters) if path is not None
+        ], 'value')
+        schema_name = self.ref(schema.field_name, 'field_name')
+        emit(lines, indent, 'errors = []')
+        for (_, field), target in zip(schema.fields.items(), targets):
+            field_name = self.ref(field.field_name, 'field_name')
+            emit(lines, indent, '# {name}'.format(name=field.field_name))
+            self.emit_find(lines, indent, field, 'value', 'v', prefixes)
+            emit(lines, indent, 'try:')
+            self.emit_run(lines, indent + 1, field, 'v')
+            hook = getattr(schema, 'validate_' + field.field_name, None)
+            if hook is not None:
+                hook = self.ref(hook, 'hook')
+                emit(lines, indent + 1, 'v = {hook}(v)'.format(hook=hook))
+            emit(lines, indent, 'except ValidationError as e:')
+            emit(lines, indent + 1, 'errors.append(e.with_field_name({name}))'
+                 .format(name=field_name))
+            if schema.errors_limit:
+                emit(lines, indent + 1, 'if len(errors) == {limit!r}:'.format(
+                    limit=schema.errors_limit))
+                emit(lines, indent + 2, 'raise ValidationError(errors, {name})'
+                     .format(name=schema_name))
+            emit(lines, indent, 'else:')
+            emit(lines, indent + 1, '{target} = v'.format(target=target))
+
+        emit(lines, indent, 'if errors:')
+        emit(lines, indent + 1, 'raise ValidationError(errors, {name})'.format(
+            name=schema_name))
+
+    def compile_schema(self, schema):
+        """Generates `convert_to_type` function for the `schema`."""
+        key = id(schema)
+        if key not in self.schemas:
+            name = self.schemas[key] = self.ref(None, 'convert_schema')
+            lines = ['def {name}(value):'.format(name=name)]
+            if schema.is_lazy:
+                schema_ref = self.ref(schema, 'schema')
+                self.emit(lines, 1, 'result = LazyRecord({schema}, value)'
+                          .format(schema=schema_ref))
+            elif schema.is_record:
+                # Values are passed to the record class without a `dict`
+                cls = schema.record_class
+                targets = ['c{n}'.format(n=cls._fields.index(field.field_name))
+                           for _, field in schema.fields.items()]
+                self.emit_fields(lines, 1, schema, targets)
+                self.emit(lines, 1, 'result = {cls}({args})'.format(
+                    cls=self.ref(cls, 'record_class'),
+                    args=', '.join(['c{n}'.format(n=n)
+                                    for n in range(len(cls._fields))])))
+            else:
+                self.emit(lines, 1, 'result = {}')
+                targets = ['result[{name}]'.format(
+                           name=self.ref(field.field_name, 'field_name'))
+                           for _, field in schema.fields.items()]
+                self.emit_fields(lines, 1, schema, targets)
+            if schema.result_factory is not NULL:
+                factory = self.ref(schema.result_factory, 'result_factory')
+                self.emit(lines, 1, 'result = {factory}(result)'.format(
+                    factory=factory))
+            self.emit(lines, 1, 'return result')
+            self.lines.extend(lines + [''])
+        return self.schemas[key]
+
+    def compile_row(self, schema):
+        """Generates function returning a tuple of values of the `schema`
+        fields instead of a `dict`. Blank documents are allowed.
+        """
+        lines = ['def row(data):']
+        self.emit_find(lines, 1, schema, 'data', 'value')
+        targets = ['c{n}'.format(n=n) for n in range(len(schema.fields))]
+        self.emit_fields(lines, 1, schema, targets)
+        self.emit(lines, 1, 'return ({targets})'.format(
+            targets=''.join(t + ', ' for t in targets)))
+        self.lines.extend(lines + [''])
+        return 'row'
+
+    def compile_field(self, schema, field):
+        """Generates function finding and validating value of the `field` of
+        the `schema`, including its `validate_<name>` method.
+        """
+        name = self.ref(None, 'field')
+        lines = ['def {name}(value):'.format(name=name)]
+        self.emit_find(lines, 1, field, 'value', 'v')
+        self.emit_run(lines, 1, field, 'v')
+        hook = getattr(schema, 'validate_' + field.field_name, None)
+        if hook is not None:
+            self.emit(lines, 1, 'v = {hook}(v)'.format(
+                hook=self.ref(hook, 'hook')))
+        self.emit(lines, 1, 'return v')
+        self.lines.extend(lines + [''])
+        return name
+
+    def compile_parse(self, schema):
+        lines = ['def parse(data):']
+        self.emit_find(lines, 1, schema, 'data', 'v')
+        self.emit_run(lines, 1, schema, 'v')
+        self.emit(lines, 1, 'return v')
+        self.lines.extend(lines + [''])
+        return 'parse'
+
+    def execute(self, schema):
+        """Executes the generated code, returns its source."""
+        source = '\n'.join(self.lines)
+        filename = '<jsonobjects.compiled {cls_name}>'.format(
+            cls_name=schema.__class__.__name__)
+        code = compile(source, filename, 'exec')
+        exec(code, self.namespace)
+        return source
+
+    def build(self, schema, compile_function=None):
+        name = (compile_function or self.compile_parse)(schema)
+        source = self.execute(schema)
+        parse = self.namespace[name]
+        parse.source = source
+        return parse
+
+
+def compile_schema(schema, trusted=False):
+    """Returns a function equivalent to `schema.parse` with all stages of
+    the bound fields tree specialized into generated code, see `_Builder`
+    for `trusted`.
+    """
+    return _Builder(trusted).build(schema)
+
+
+TrustInfo = namedtuple('TrustInfo', ['documents', 'sampled', 'violations'])
+
+
+class SampledParser(object):
+    """Parses documents by the `trusted` parser, except a random `fraction`
+    of them which are parsed by both parsers and the result of the
+    `validated` parser is returned. Counts sampled documents and violations,
+    i.e. invalid ones or ones parsed differently by the parsers, see
+    `info()`. Results which can't be compared (e.g. containing NumPy
+    arrays) are taken as the same.
+    """
+
+    def __init__(self, trusted, validated, fraction):
+        self.trusted = trusted
+        self.validated = validated
+        self.fraction = fraction
+        self.documents = 0
+        self.sampled = 0
+        self.violations = 0
+
+    def __call__(self, data):
+        self.documents += 1
+        if random.random() >= self.fraction:
+            return self.trusted(data)
+        self.sampled += 1
+        try:
+            result = self.validated(data)
+        except ValidationError:
+            self.violations += 1
+            raise
+        try:
+            trusted_result = self.trusted(data)
+        except ValidationError:
+            trusted_result = NULL
+        try:
+            different = bool(trusted_result != result)
+        except (TypeError, ValueError):
+            different = False
+        if different:
+            self.violations += 1
+        return result
+
+    def info(self):
+        return TrustInfo(self.documents, self.sampled, self.violations)
+
+
+def compile_row(schema):
+    """Returns a function parsing documents with the `schema` into tuples
+    of values of the fields in order of `schema.fields`. Neither empty
+    values validation of the document nor `result_factory` is applied.
+    """
+    builder = _Builder()
+    return builder.build(schema, builder.compile_row)
+
+
+def compile_fields(schema):
+    """Returns a `dict` of names of the `schema` fields to functions
+    equivalent to `schema.run_field` for them.
+    """
+    builder = _Builder()
+    names = dict((field_name, builder.compile_field(schema, field))
+                 for field_name, field in schema.fields.items())
+    builder.execute(schema)
+    return dict((field_name, builder.namespace[name])
+                for field_name, name in names.items())
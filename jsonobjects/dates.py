@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import datetime
+
+
+__all__ = ['FixedOffset', 'fixed_timezone', 'parse_iso_8601']
+
+
+class FixedOffset(datetime.tzinfo):
+    """Fixed offset timezone for Python 2, which has no
+    `datetime.timezone`.
+    """
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def utcoffset(self, dt):
+        return self.offset
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        minutes = self.offset.days * 1440 + self.offset.seconds // 60
+        sign = '-' if minutes < 0 else '+'
+        return 'UTC{sign}{hours:02d}:{minutes:02d}'.format(
+            sign=sign, hours=abs(minutes) // 60, minutes=abs(minutes) % 60)
+
+    def __reduce__(self):
+        return fixed_timezone, (self.offset,)
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({offset!r})'.format(cls_name=cls_name,
+                                               offset=self.offset)
+
+
+_timezone = getattr(datetime, 'timezone', FixedOffset)
+
+# Timezones by offsets, so parsed values share them
+_TIMEZONES = {}
+
+
+def fixed_timezone(offset):
+    """Returns the shared `tzinfo` of the `offset` (`datetime.timedelta`)."""
+    try:
+        return _TIMEZONES[offset]
+    except KeyError:
+        return _TIMEZONES.setdefault(offset, _timezone(offset))
+
+
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+
+# Characters after the date part which `fromisoformat` may be given
+_SEPARATORS = ('', 'T', ' ')
+
+_ISO_8601 = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6}))?)?'
+    r'(?:(Z)|([+-])(\d{2})(?::?(\d{2}))?)?)?$')
+
+
+def parse_iso_8601(value):
+    """Returns `datetime.datetime` of the common ISO-8601 shapes, like
+    `2015-03-13`, `2015-03-13T12:00:00.5Z` or `2015-03-13 12:00+05:30`, or
+    `None` if the `value` should be parsed by `dateutil`. Raises
+    `ValueError` for out of range values.
+    """
+    if _fromisoformat is not None and value[10:11] in _SEPARATORS:
+        try:
+            result = _fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            if result.tzinfo is not None:
+                result = result.replace(tzinfo=fixed_timezone(
+                    result.tzinfo.utcoffset(result)))
+            return result
+
+    match = _ISO_8601.match(value)
+    if match is None:
+        return None
+    (year, month, day, hour, minute, second, fraction,
+     utc, sign, offset_hours, offset_minutes) = match.groups()
+
+    tzinfo = None
+    if utc:
+        tzinfo = fixed_timezone(datetime.timedelta(0))
+    elif sign:
+        offset = datetime.timedelta(hours=int(offset_hours),
+                                    minutes=int(offset_minutes or 0))
+        tzinfo = fixed_timezone(-offset if sign == '-' else offset)
+
+    return datetime.datetime(
+        int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+        int(second or 0), int(fraction.ljust(6, '0')) if fraction else 0,
+        tzinfo)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import decimal
+from collections import OrderedDict
+from .exceptions import GenericError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+
+__all__ = ['DECODERS', 'INVALID_JSON', 'get_decoder', 'to_buffer']
+
+
+INVALID_JSON = 'A valid JSON document is required: {error}.'
+
+
+def to_buffer(data):
+    """Converts `bytearray` and `memoryview` to `bytes`, other data is
+    returned unchanged.
+    """
+    if isinstance(data, (bytearray, memoryview)):
+        return memoryview(data).tobytes()
+    return data
+
+
+def _json_loads(data, use_decimal=False):
+    data = to_buffer(data)
+    # Python 3 before 3.6 accepts only text
+    if isinstance(data, bytes) and bytes is not str:
+        data = data.decode('utf-8')
+    if use_decimal:
+        return json.loads(data, parse_float=decimal.Decimal)
+    return json.loads(data)
+
+
+def _simplejson_loads(data, use_decimal=False):
+    return simplejson.loads(to_buffer(data), use_decimal=use_decimal)
+
+
+def _orjson_loads(data, use_decimal=False):
+    return orjson.loads(data)
+
+
+def _simdjson_loads(data, use_decimal=False):
+    return simdjson.loads(to_buffer(data))
+
+
+def _ujson_loads(data, use_decimal=False):
+    return ujson.loads(to_buffer(data))
+
+
+class Decoder(object):
+
+    def __init__(self, name, loads, available=True, decimals=False,
+                 buffers=False):
+        self.name = name
+        self.loads = loads
+        self.available = available
+        # Floats can be decoded as `decimal.Decimal`
+        self.decimals = decimals
+        # Any buffer (e.g. `mmap`) can be decoded without copying
+        self.buffers = buffers
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({name!r})'.format(cls_name=cls_name,
+                                             name=self.name)
+
+
+# Ordered from the fastest one
+DECODERS = OrderedDict([
+    ('orjson', Decoder('orjson', _orjson_loads, orjson is not None,
+                       buffers=True)),
+    ('simdjson', Decoder('simdjson', _simdjson_loads, simdjson is not None)),
+    ('ujson', Decoder('ujson', _ujson_loads, ujson is not None)),
+    ('simplejson', Decoder('simplejson', _simplejson_loads,
+                           simplejson is not None, decimals=True)),
+    ('json', Decoder('json', _json_loads, decimals=True)),
+])
+
+
+class _FallbackLoads(object):
+    """`loads` of a decoder, which decodes documents it rejects again by
+    `json`, e.g. ones with NaN or Infinity.
+    """
+
+    def __init__(self, loads):
+        self.loads = loads
+
+    def __call__(self, data, use_decimal=False):
+        try:
+            return self.loads(data, use_decimal)
+        except ValueError:
+            return _json_loads(data, use_decimal)
+
+
+# Decoders picked by default by names, see `get_decoder`
+_DEFAULTS = {}
+
+
+def get_decoder(name=None, use_decimal=False):
+    """Returns the `Decoder` called `name` or the fastest available one
+    which supports `use_decimal`.
+
+    The default decoder accepts the same documents as `json`: ones it
+    rejects are decoded again by `json`. Decoded values may still differ,
+    e.g. `orjson` decodes integers out of the 64 bit range as floats,
+    `json` and `simplejson` keep them exact.
+    """
+    if name is None:
+        for decoder in DECODERS.values():
+            if decoder.available and (decoder.decimals or not use_decimal):
+                if decoder.name == 'json':
+                    return decoder
+                if decoder.name not in _DEFAULTS:
+                    _DEFAULTS[decoder.name] = Decoder(
+                        decoder.name, _FallbackLoads(decoder.loads),
+                        decimals=decoder.decimals, buffers=decoder.buffers)
+                return _DEFAULTS[decoder.name]
+
+    if name not in DECODERS:
+        allowed = ', '.join([repr(d) for d in DECODERS])
+        msg = (
+            "Decoder '{name}' is not supported; choose one of {allowed}."
+        ).format(name=name, allowed=allowed)
+        raise GenericError(msg)
+
+    decoder = DECODERS[name]
+    assert decoder.available, (
+        "`{name}` is not installed. Use `pip install {name}` command to "
+        "install this package."
+    ).format(name=name)
+    assert decoder.decimals or not use_decimal, (
+        "`{name}` decoder does not support `use_decimal`."
+    ).format(name=name)
+    return decoder
@@ -19,6 +19,9 @@ class NotFound(GenericError):
     def __str__(self):
         return self.source
 
+    def __reduce__(self):
+        return self.__class__, (self.source,), self.__dict__
+
     def __repr__(self):
         cls_name = self.__class__.__name__
         return '{cls_name}({source!r},)'.format(cls_name=cls_name,
@@ -26,11 +29,39 @@ class NotFound(GenericError):
 
 
 class ValidationError(GenericError):
+    # Position of the invalid item for bulk parsing
+    index = None
+    # Line number and byte offset of the invalid item for streaming parsing
+    line = None
+    offset = None
 
-    def __init__(self, messages, field_name=None):
+    def __init__(self, messages, field_name=None, params=None):
         GenericError.__init__(self)
-        self.messages = to_iterable(messages)
+        if type(messages) is not list:
+            messages = to_iterable(messages)
+        self._messages = messages
         self.field_name = field_name
+        # Messages are formatted with `params` only when they are accessed
+        self.params = params
+
+    @property
+    def messages(self):
+        if self.params is not None:
+            params = self.params
+            self._messages = [m.format(**params) for m in self._messages]
+            self.params = None
+        return self._messages
+
+    @messages.setter
+    def messages(self, messages):
+        self._messages = to_iterable(messages)
+        self.params = None
+
+    def with_field_name(self, field_name):
+        """Returns copy of the error for the `field_name`, which keeps the
+        messages unformatted.
+        """
+        return ValidationError(self._messages, field_name, self.params)
 
     @property
     def flatten_messages(self):
@@ -54,3 +85,8 @@ class ValidationError(GenericError):
 
     def __str__(self):
         return str(self.messages)
+
+    def __reduce__(self):
+        # Keep `index` and other attributes set for bulk parsing
+        messages = self.messages
+        return (self.__class__, (messages, self.field_name), self.__dict__)
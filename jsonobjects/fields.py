@@ -5,27 +5,59 @@ import re
 import copy
 import inspect
 import decimal
+import numbers
 import datetime
 from collections import Mapping
 from . import path
-from .exceptions import NotFound, ValidationError
+from .dates import parse_iso_8601
+from .exceptions import ValidationError
+from .stream import ALL, ANY, merge_projections, path_projection
 from .validators import (
     MinValue, MaxValue, MaxLength, MinLength, RegexValidator
 )
 from .utils import (
-    NULL, ISO_8601, smart_bool, to_iterable, is_non_str_iterable, to_unicode,
-    basestring_type, unicode_type
+    NULL, ISO_8601, LRUCache, smart_bool, to_iterable, is_non_str_iterable,
+    to_unicode, intern_string, basestring_type, unicode_type
 )
 
+
 try:
     from dateutil.parser import parse as parse_datetime
 except ImportError:
     parse_datetime = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 __all__ = ['Field', 'BooleanField', 'StringField', 'IntegerField',
            'FloatField', 'DecimalField', 'DateField', 'DateTimeField',
-           'TimeField', 'RegexField', 'ListField', 'DictField']
+           'TimeField', 'RegexField', 'ListField', 'DictField',
+           'NumericArrayField']
+
+
+def _func(obj, name):
+    method = getattr(obj, name)
+    return getattr(method, '__func__', method)
+
+
+def _is_base(field, name, base=None):
+    """Whether the method `name` of the `field` is the one of the `base`
+    (`Field` by default), i.e. it is not overridden.
+    """
+    return _func(field, name) is _func(base or Field, name)
+
+
+# Coroutine functions exist since Python 3.5
+_is_coroutine_function = getattr(inspect, 'iscoroutinefunction',
+                                 lambda func: False)
+
+
+def _is_coroutine_hook(hook):
+    return (_is_coroutine_function(hook) or
+            _is_coroutine_function(getattr(hook, '__call__', None)))
 
 
 def get_error_messages(instance):
@@ -35,8 +67,30 @@ def get_error_messages(instance):
     return messages
 
 
+def _cache_key(value):
+    """Returns the `conversions` key of the input `value`. Equal inputs
+    may convert differently, so the key keeps what equality ignores."""
+    value_type = type(value)
+    if value_type is unicode_type:
+        return value
+    if value_type is float:
+        # `0.0` equals `-0.0`
+        return value_type, repr(value)
+    if value_type is decimal.Decimal:
+        # `Decimal('1.1')` equals `Decimal('1.10')`
+        return value_type, str(value)
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        # Aware values are equal at the same instant in any offset
+        return value_type, value.isoformat(), value.tzinfo
+    # `1`, `1.0` and `True` are equal keys, but not equal inputs
+    return value_type, value
+
+
 class Field(object):
     default_blank_value = NULL
+    # Whether converted values are immutable and may be shared, see
+    # `run_cached`
+    cacheable = False
     default_error_messages = {
         'required': 'This field is required.',
         'null': 'This field may not be null.',
@@ -44,8 +98,12 @@ class Field(object):
     }
 
     def __init__(self, source=None, default=NULL, required=True, null=False,
-                 blank=False, validators=None, post_process=None, dialect=None):
+                 blank=False, validators=None, post_process=None, dialect=None,
+                 adaptive=False, cache_size=None):
         assert required or default is not NULL, '`default` should be set for not required field.'
+        assert not cache_size or self.cacheable, (
+            '`cache_size` is not supported by `{cls_name}`.'
+        ).format(cls_name=self.__class__.__name__)
 
         self.source = source
         self.default = default
@@ -55,6 +113,11 @@ class Field(object):
         self.validators = to_iterable(validators) if validators else []
         self.post_process = to_iterable(post_process) if post_process else []
         self.dialect = dialect
+        # Try sources found most often first, see `path.SourceStats`
+        self.adaptive = adaptive
+        self.source_stats = None
+        # Converted values by inputs, see `run_cached`
+        self.conversions = LRUCache(cache_size) if cache_size else None
         self.error_messages = get_error_messages(self)
 
         if self.default_blank_value is not NULL:
@@ -63,12 +126,31 @@ class Field(object):
 
         self.parent = None
         self.field_name = None
+        self._getters = None
 
     def bind(self, field_name, parent):
         self.parent = parent
         self.field_name = field_name
         if self.source is None:
             self.source = field_name
+        if self.source:
+            self._getters = self.compile_source()
+
+    def bound_copy(self, parent):
+        """Returns a copy of the bound field for the `parent`, which shares
+        only immutable data, like compiled sources, with this field.
+        """
+        field = object.__new__(self.__class__)
+        field.__dict__.update(self.__dict__)
+        field.parent = parent
+        field.validators = list(self.validators)
+        field.post_process = list(self.post_process)
+        field.error_messages = dict(self.error_messages)
+        field.source_stats = None
+        if self.conversions is not None:
+            field.conversions = LRUCache(self.conversions.maxsize)
+        field.__dict__.pop('_is_async', None)
+        return field
 
     def is_null(self, value):
         return value is None
@@ -80,7 +162,7 @@ class Field(object):
             pass
         return False
 
-    def find(self, data):
+    def compile_source(self, data=None):
         if not self.source:
             cls_name = self.__class__.__name__
             input_type = type(data).__name__
@@ -90,13 +172,53 @@ class Field(object):
                 "field from {input_type}."
             ).format(cls_name=cls_name, name=name, input_type=input_type)
             raise AssertionError(msg)
+        # Allow to search for multiple sources, see `path.getter`
+        return [path.getter(src, self.dialect)
+                for src in to_iterable(self.source)]
+
+    def _create_source_stats(self):
+        self.source_stats = path.SourceStats(to_iterable(self.source))
+        return self.source_stats
+
+    def get_projection(self):
+        """Returns projection of values of the field, see `stream.ALL`."""
+        return ALL
+
+    def get_source_projection(self):
+        """Returns projection of the data the field is found in. Should be
+        overridden together with `find`, otherwise the data is kept whole.
+        """
+        if not _is_base(self, 'find'):
+            return ALL
+        return self._getters_projection()
+
+    def _getters_projection(self):
+        getters = self._getters
+        if getters is None:
+            getters = self._getters = self.compile_source()
+
+        value_projection = self.get_projection()
+        projection = {}
+        for get in getters:
+            projection = merge_projections(
+                projection, path_projection(get, value_projection))
+        return projection
 
-        # Allow to search for multiple sources
-        for src in to_iterable(self.source):
-            try:
-                return path.find(src, data, self.dialect)
-            except NotFound:
-                pass
+    def find(self, data):
+        getters = self._getters
+        if getters is None:
+            getters = self._getters = self.compile_source(data)
+
+        if self.adaptive:
+            stats = self.source_stats or self._create_source_stats()
+            return stats.find(getters, data)
+
+        # Missing values are common for optional and multi-source fields,
+        # so they are not reported by exceptions
+        for get in getters:
+            value = get(data)
+            if value is not NULL:
+                return value
         return NULL
 
     def validate_empty_values(self, value):
@@ -136,12 +258,35 @@ class Field(object):
         is_empty, value = self.validate_empty_values(value)
         if is_empty:
             return value
-        value = self.convert_to_type(value)
-        self.run_validators(value)
-        value = self.validate(value)
+        if self.conversions is not None:
+            value = self.run_cached(value)
+        else:
+            value = self.convert_to_type(value)
+            self.run_validators(value)
+            value = self.validate(value)
         value = self.run_post_process(value)
         return value
 
+    def run_cached(self, value):
+        """Same as `convert_to_type`, `run_validators` and `validate`, but
+        valid results are kept in the `conversions` cache by hashable input
+        values. Cached strings are interned.
+        """
+        key = _cache_key(value)
+        try:
+            result = self.conversions.get(key)
+        except TypeError:
+            key = NULL
+            result = NULL
+
+        if result is NULL:
+            result = self.convert_to_type(value)
+            self.run_validators(result)
+            result = self.validate(result)
+            if key is not NULL:
+                result = self.conversions.set(key, intern_string(result))
+        return result
+
     def run_post_process(self, value):
         if self.post_process:
             for process in self.post_process:
@@ -162,9 +307,24 @@ class Field(object):
             ).format(cls_name=cls_name, key=key)
             raise AssertionError(msg)
 
-        raise ValidationError(msg.format(**kwargs), self.field_name)
+        raise ValidationError(msg, self.field_name, kwargs)
+
+    @property
+    def is_async(self):
+        """Whether the field or its child has coroutine validators or post
+        processors, which are awaited by `aparse` only.
+        """
+        if not hasattr(self, '_is_async'):
+            hooks = list(self.validators) + list(self.post_process)
+            child = getattr(self, 'child', None)
+            self._is_async = (any(_is_coroutine_hook(h) for h in hooks) or
+                              isinstance(child, Field) and child.is_async)
+        return self._is_async
 
     def parse(self, data):
+        assert not self.is_async, (
+            'Fields with coroutine hooks are parsed by `aparse` only.'
+        )
         value = self.find(data)
         return self.run_validation(value)
 
@@ -184,6 +344,7 @@ class Field(object):
 
 
 class BooleanField(Field):
+    cacheable = True
 
     def is_blank(self, value):
         return False
@@ -195,6 +356,7 @@ class BooleanField(Field):
 
 
 class StringField(Field):
+    cacheable = True
     default_blank_value = str
     default_error_messages = {
         'invalid': 'A valid string is required.',
@@ -285,6 +447,13 @@ class IntegerField(BaseNumberField):
     re_decimal = re.compile(r'\.0*\s*$')  # allow e.g. '1.0' as an int, but not '1.2'
 
     def number_type(self, value):
+        if type(value) is int:
+            return value
+        if isinstance(value, decimal.Decimal):
+            # E.g. `1e2` decoded with `use_decimal`
+            if not value.is_finite() or value != value.to_integral_value():
+                raise ValueError(value)
+            return int(value)
         return int(self.re_decimal.sub('', str(value)))
 
 
@@ -303,6 +472,7 @@ class FloatField(BaseNumberField):
 
 
 class DecimalField(BaseNumberField):
+    cacheable = True
 
     def number_type(self, value):
         if not isinstance(value, decimal.Decimal):
@@ -311,16 +481,25 @@ class DecimalField(BaseNumberField):
             except decimal.DecimalException:
                 self.fail('invalid')
 
-        if value != value:
-            self.fail('invalid')
-
-        if value in (decimal.Decimal('Inf'), decimal.Decimal('-Inf')):
+        # NaN or infinity
+        if not value.is_finite():
             self.fail('invalid')
 
         return value
 
 
+class _FormatsRepr(object):
+    """Lists `formats` in error messages only when they are formatted."""
+
+    def __init__(self, formats):
+        self.formats = formats
+
+    def __format__(self, spec):
+        return ', '.join([repr(format) for format in self.formats])
+
+
 class BaseDateField(Field):
+    cacheable = True
     default_error_messages = {
         'invalid': 'A valid date is required. Allowed formats: {formats}.',
         'max_string_length': 'String value too large.',
@@ -330,7 +509,17 @@ class BaseDateField(Field):
 
     def __init__(self, source=None, **kwargs):
         self.formats = kwargs.pop('formats', self.default_formats)
+        # Whether the format which parsed the last value is tried first,
+        # which is only safe if `formats` don't parse the same values
+        # differently (e.g. `%m/%d/%Y` and `%d/%m/%Y` do)
+        self.memoize_format = kwargs.pop('memoize_format', False)
         super(BaseDateField, self).__init__(source, **kwargs)
+        self._format_index = 0
+
+    def bound_copy(self, parent):
+        field = super(BaseDateField, self).bound_copy(parent)
+        field._format_index = 0
+        return field
 
     def convert_to_type(self, value):
         if isinstance(value, basestring_type):
@@ -338,17 +527,32 @@ class BaseDateField(Field):
             if len(value) > self.MAX_STRING_LENGTH:
                 self.fail('max_string_length')
 
-            for format in self.formats:
+            formats = self.formats
+            index = self._format_index
+            if index < len(formats):
+                try:
+                    return self.parse_date(value, formats[index])
+                except (ValueError, TypeError):
+                    pass
+
+            for i, format in enumerate(formats):
+                if i == index:
+                    continue
                 try:
-                    return self.parse_date(value, format)
+                    result = self.parse_date(value, format)
                 except (ValueError, TypeError):
                     continue
+                if self.memoize_format:
+                    self._format_index = i
+                return result
 
-        formats_repr = ', '.join([repr(format) for format in self.formats])
-        self.fail('invalid', formats=formats_repr)
+        self.fail('invalid', formats=_FormatsRepr(self.formats))
 
     def parse_date(self, value, format):
         if format.lower() == ISO_8601:
+            result = parse_iso_8601(value)
+            if result is not None:
+                return result
             assert parse_datetime, (
                 '`dateutils` is not installed. Use `pip install dateutils` '
                 'command to install this package.'
@@ -440,11 +644,22 @@ class ListField(Field):
 
         self.child.bind('', self)
 
+    def bound_copy(self, parent):
+        field = super(ListField, self).bound_copy(parent)
+        field.child = self.child.bound_copy(field)
+        return field
+
     def convert_to_type(self, value):
         if not is_non_str_iterable(value):
             self.fail('invalid_type', input_type=type(value).__name__)
         return [self.child.run_validation(v) for v in value]
 
+    def get_projection(self):
+        if not _is_base(self, 'convert_to_type', ListField):
+            return ALL
+        # Arrays are transparent for projections
+        return self.child.get_projection()
+
 
 class DictField(Field):
     child = Field(null=True, blank=True)
@@ -463,8 +678,144 @@ class DictField(Field):
 
         self.child.bind('', self)
 
+    def bound_copy(self, parent):
+        field = super(DictField, self).bound_copy(parent)
+        field.child = self.child.bound_copy(field)
+        return field
+
     def convert_to_type(self, value):
         if not isinstance(value, Mapping):
             self.fail('invalid_type', input_type=type(value).__name__)
         return {to_unicode(k): self.child.run_validation(v)
                 for k, v in value.items()}
+
+    def get_projection(self):
+        if not _is_base(self, 'convert_to_type', DictField):
+            return ALL
+        projection = self.child.get_projection()
+        return ALL if projection is ALL else {ANY: projection}
+
+
+def _empty_array():
+    return numpy.array([])
+
+
+def _is_integral(value):
+    try:
+        return value == int(value)
+    except (OverflowError, ValueError):
+        return False  # Infinity and NaN
+
+
+def _format_indexes(indexes, limit=10):
+    formatted = ', '.join([str(i) for i in indexes[:limit]])
+    if len(indexes) > limit:
+        formatted += ' and {n} more'.format(n=len(indexes) - limit)
+    return formatted
+
+
+class NumericArrayField(Field):
+    """List of numbers converted at once into one-dimensional
+    `numpy.ndarray` of `dtype`. Limits and `precision` are applied to the
+    whole array and errors report indexes of the invalid items.
+    """
+    default_blank_value = staticmethod(_empty_array)
+    default_error_messages = {
+        'invalid_type': "Expected a list of numbers but got type '{input_type}'.",
+        'invalid': 'A valid number is required at indexes: {indexes}.',
+        'max_value': 'Ensure items are less than or equal to {limit} at indexes: {indexes}.',
+        'min_value': 'Ensure items are greater than or equal to {limit} at indexes: {indexes}.',
+    }
+
+    def __init__(self, source=None, dtype='float64', **kwargs):
+        assert numpy, (
+            '`numpy` is not installed. Use `pip install numpy` command to '
+            'install this package.'
+        )
+        self.dtype = numpy.dtype(dtype)
+        self.precision = kwargs.pop('precision', None)
+        self.max_value = kwargs.pop('max_value', None)
+        self.min_value = kwargs.pop('min_value', None)
+
+        super(NumericArrayField, self).__init__(source, **kwargs)
+
+        if self.max_value is not None:
+            self.validators.append(MaxValue(self.max_value))
+        if self.min_value is not None:
+            self.validators.append(MinValue(self.min_value))
+
+    def convert_to_type(self, value):
+        if isinstance(value, Mapping) or not is_non_str_iterable(value):
+            self.fail('invalid_type', input_type=type(value).__name__)
+
+        try:
+            array = numpy.asarray(value)
+        except ValueError:
+            array = None  # E.g. nested lists of different lengths
+
+        if array is None or array.ndim != 1 or array.dtype.kind not in 'biuf':
+            # Strings, `None` and nested lists are checked one by one
+            items = list(value)
+            invalid = [i for i, v in enumerate(items) if not self.is_number(v)]
+            if invalid:
+                self.fail('invalid', indexes=_format_indexes(invalid))
+            array = numpy.array([float(v) if isinstance(v, basestring_type)
+                                 else v for v in items])
+
+        if self.dtype.kind in 'iu' and \
+                not numpy.can_cast(array.dtype, self.dtype):
+            invalid = self.find_non_integers(array)
+            if len(invalid):
+                self.fail('invalid', indexes=_format_indexes(invalid))
+
+        array = array.astype(self.dtype)
+        if self.precision and self.dtype.kind == 'f':
+            array = numpy.round(array, self.precision)
+        return array
+
+    def find_non_integers(self, array):
+        """Returns indexes of the `array` items, which are not integers in
+        the range of the integer `dtype`, so they would not be cast as is.
+        """
+        info = numpy.iinfo(self.dtype)
+        if array.dtype.kind == 'O':
+            # Python ints may be out of the range of any dtype
+            return [i for i, v in enumerate(array.tolist())
+                    if not _is_integral(v) or not info.min <= v <= info.max]
+        if array.dtype.kind == 'f':
+            # Allow e.g. 1.0 as an int, but not 1.2, NaN or 1e20. The float
+            # of `info.max` may be rounded up out of the range
+            valid = (numpy.isfinite(array) & (array == numpy.trunc(array)) &
+                     (array >= info.min) & (array < info.max + 1))
+        else:
+            valid = (array >= info.min) & (array <= info.max)
+        return numpy.flatnonzero(~valid)
+
+    def is_number(self, value):
+        if isinstance(value, basestring_type):
+            try:
+                value = float(value)
+            except ValueError:
+                return False
+        return (isinstance(value, numbers.Number) and
+                not isinstance(value, complex))
+
+    def run_validators(self, value):
+        for validate in self.validators:
+            if isinstance(validate, MinValue):
+                self.check_limit('min_value', value, validate.limit)
+            elif isinstance(validate, MaxValue):
+                self.check_limit('max_value', value, validate.limit)
+            else:
+                validate(value)
+        return value
+
+    def check_limit(self, key, value, limit):
+        # NaN is neither less nor greater than the limit
+        with numpy.errstate(invalid='ignore'):
+            if key == 'min_value':
+                invalid = numpy.flatnonzero(~(value >= limit))
+            else:
+                invalid = numpy.flatnonzero(~(value <= limit))
+        if len(invalid):
+            self.fail(key, limit=limit, indexes=_format_indexes(invalid))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import mmap
+import time
+import multiprocessing
+from itertools import islice
+from .decoders import INVALID_JSON, get_decoder
+from .exceptions import ValidationError
+
+
+__all__ = ['create_pool', 'parse_document', 'iter_chunks', 'parse_chunk', 'parse_chunks',
+           'Shard', 'split_file', 'parse_shard', 'parse_shards']
+
+
+# Schema of the worker process, see `create_pool`
+_schema = None
+
+
+def _init_worker(schema):
+    global _schema
+    _schema = schema
+
+
+def create_pool(schema, workers=None, context=None):
+    """Returns `multiprocessing.Pool` of `workers` processes parsing with
+    the `schema`, created by the multiprocessing `context` if it is given.
+    The schema is passed to the workers only once on their start, so it
+    doesn't need to be picklable with the `fork` start method.
+    """
+    context = context or multiprocessing
+    return context.Pool(workers, _init_worker, (schema,))
+
+
+def parse_document(data):
+    """Parses `data` with the schema of the worker process."""
+    return _schema.compiled(data)
+
+
+def iter_chunks(iterable, chunk_size):
+    """Yields `(start, items)` with lists of `chunk_size` items."""
+    iterator = iter(iterable)
+    start = 0
+    while True:
+        items = list(islice(iterator, chunk_size))
+        if not items:
+            return
+        yield start, items
+        start += len(items)
+
+
+def parse_chunk(parse, start, items, on_error):
+    """Returns `(results, errors)` of the parsed `items`, where `errors` is
+    a list of `(index, ValidationError)` pairs. Stops on the first error if
+    `on_error` is 'raise'.
+    """
+    results = []
+    errors = []
+    append = results.append
+    for index, data in enumerate(items, start):
+        try:
+            append(parse(data))
+        except ValidationError as e:
+            e.index = index
+            errors.append((index, e))
+            if on_error == 'raise':
+                break
+    return results, errors
+
+
+def _parse_chunk(args):
+    start, items, on_error = args
+    return parse_chunk(_schema.compiled, start, items, on_error)
+
+
+def parse_chunks(pool, iterable, on_error, chunk_size):
+    """Parses chunks of the `iterable` by workers of the `pool`, yields
+    `(results, errors)` of each chunk preserving the input order.
+    """
+    tasks = ((start, items, on_error)
+             for start, items in iter_chunks(iterable, chunk_size))
+    return pool.imap(_parse_chunk, tasks)
+
+
+class Shard(object):
+    """Results and statistics of a parsed byte range of a file."""
+
+    def __init__(self, index, start, end):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.results = []
+        self.errors = []
+        self.lines = 0
+        self.seconds = 0.0
+
+    @property
+    def throughput(self):
+        """Bytes per second."""
+        return (self.end - self.start) / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        msg = '{cls_name}({index}, {start}, {end})'
+        return msg.format(cls_name=cls_name, index=self.index,
+                          start=self.start, end=self.end)
+
+
+def split_file(path, shards):
+    """Returns `(start, end)` byte ranges of the file. Every line belongs to
+    the range it starts in, see `parse_shard`.
+    """
+    size = os.path.getsize(path)
+    shards = max(min(shards, size), 1)
+    bounds = [size * i // shards for i in range(shards + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(shards)
+            if bounds[i] < bounds[i + 1]]
+
+
+def parse_shard(parse, loads, path, index, start, end, on_error):
+    """Parses newline delimited JSON documents starting in `[start, end)`
+    range of the file, reading it through `mmap`.
+
+    Errors have `offset` in the file, `line` and `index` relative to the
+    shard set.
+    """
+    shard = Shard(index, start, end)
+    began = time.time()
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            size = len(mapped)
+            pos = start
+            # Line which started before belongs to the previous shard
+            if pos > 0 and mapped[pos - 1:pos] != b'\n':
+                newline = mapped.find(b'\n', pos)
+                pos = size if newline == -1 else newline + 1
+
+            records = 0
+            while pos < end:
+                newline = mapped.find(b'\n', pos)
+                line_end = size if newline == -1 else newline
+                line = mapped[pos:line_end]
+                shard.lines += 1
+                if line.strip():
+                    try:
+                        try:
+                            data = loads(line)
+                        except ValueError as e:
+                            raise ValidationError(
+                                INVALID_JSON.format(error=e))
+                        shard.results.append(parse(data))
+                    except ValidationError as e:
+                        e.index, e.line, e.offset = records, shard.lines, pos
+                        shard.errors.append((records, e))
+                        if on_error == 'raise':
+                            break
+                    records += 1
+                pos = line_end + 1
+        finally:
+            mapped.close()
+    shard.seconds = time.time() - began
+    return shard
+
+
+def _parse_shard(args):
+    path, index, start, end, on_error, decoder, use_decimal = args
+    decoder = get_decoder(decoder, use_decimal)
+    return parse_shard(_schema.compiled,
+                       lambda line: decoder.loads(line, use_decimal),
+                       path, index, start, end, on_error)
+
+
+def parse_shards(pool, path, shards, on_error, decoder, use_decimal,
+                 ordered=True):
+    """Parses byte ranges of the file by workers of the `pool`, yields
+    `Shard`s in the order of ranges or as soon as they are parsed.
+    """
+    tasks = [(path, index, start, end, on_error, decoder, use_decimal)
+             for index, (start, end) in enumerate(split_file(path, shards))]
+    if ordered:
+        return pool.imap(_parse_shard, tasks)
+    return pool.imap_unordered(_parse_shard, tasks)
@@ -1,9 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from collections import Mapping, Sequence
+import re
+from collections import Mapping, Sequence, namedtuple
 from .exceptions import GenericError, NotFound
-from .utils import NULL
+from .utils import NULL, LRUCache
 
 try:
     import jmespath
@@ -33,21 +34,57 @@ def _is_sequence(v):
             (isinstance(v, Sequence) or hasattr(v, '__getitem__')))
 
 
+def _step_key(k, value):
+    if type(value) is dict or _is_mapping(value):
+        return value.get(k, NULL)
+    if _is_sequence(value):
+        return NULL
+    try:
+        return value.get(k, NULL)
+    except AttributeError:
+        return NULL
+
+
+def _step_index(i, value):
+    if type(value) is not list and not _is_sequence(value):
+        return NULL
+    try:
+        return value[i]
+    except (IndexError, TypeError):
+        return NULL
+
+
+def _step_any(_, value):
+    if not _is_mapping(value) or not value:
+        return NULL
+    return value[next(iter(value))]
+
+
 class Path(object):
+    """Default dialect path, e.g. `results.0.name`.
+
+    The source is tokenized once into `steps`, a tuple of
+    `(evaluator, key)` pairs, so `get()` is a plain loop. Instances are
+    immutable and may be shared, use `compile()` to get a cached one.
+    """
     KEY_TOK, IDX_TOK, ANY_TOK = ('key', 'index', '?')
 
+    _evaluators = {
+        KEY_TOK: _step_key,
+        IDX_TOK: _step_index,
+        ANY_TOK: _step_any,
+    }
+
     def __init__(self, source, delim='.', allow_null=False):
         self.source = source
         self.delim = delim
         self.allow_null = allow_null
+        self.steps = tuple(self._compile(source))
 
-    def _head(self, source):
-        parts = source.split(self.delim, 1)
-        if len(parts) == 1:
-            head, tail = parts[0], None
-        else:
-            head, tail = parts
-        return head, tail
+    def _compile(self, source):
+        for part in source.split(self.delim):
+            k, tok = self._token(part)
+            yield self._evaluators[tok], k
 
     def _token(self, k):
         if k == '?':
@@ -57,99 +94,281 @@ class Path(object):
         else:
             return _unquote(k), self.KEY_TOK
 
-    def _eval_key(self, k, value):
-        return value.get(k, NULL)
-
-    def _eval_index(self, i, value):
-        try:
-            return value[i]
-        except (IndexError, TypeError):
-            return NULL
-
-    def _eval_any(self, _, value):
-        return value[value.keys()[0]] if value else NULL
+    def get(self, data, default=NULL):
+        """Returns the value or `default` if it is not found, which is
+        cheaper than catching `NotFound` for optional fields.
+        """
+        for evaluate, k in self.steps:
+            data = evaluate(k, data)
+            if data is NULL:
+                return default
 
-    def _eval_attr(self, k, value):
-        return getattr(value, k, NULL)
+        if not self.allow_null and data is None:
+            return default
+        return data
 
-    def _eval(self, key, data):
-        k, tok = self._token(key)
-        is_map = _is_mapping(data)
-        is_idx = _is_sequence(data)
-
-        eval_tok = None
-        if is_idx:
-            if tok == self.IDX_TOK:
-                eval_tok = self._eval_index
-
-        elif is_map:
-            if tok == self.ANY_TOK:
-                eval_tok = self._eval_any
-            elif tok == self.KEY_TOK:
-                eval_tok = self._eval_key
-
-        else:
-            if tok == self.KEY_TOK:
-                eval_tok = self._eval_key
-
-        return eval_tok(k, data) if eval_tok else NULL
+    def find(self, data):
+        value = self.get(data)
+        if value is NULL:
+            raise NotFound(self.source)
+        return value
 
-    def _walk(self, tail, data):
-        head, tail = self._head(tail)
-        data = self._eval(head, data)
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({source!r})'.format(cls_name=cls_name,
+                                               source=self.source)
 
-        if data is NULL:
-            raise NotFound(self.source)
 
-        if not tail:
-            if not self.allow_null and data is None:
-                raise NotFound(self.source)
-            return data
+PATH_CACHE = LRUCache(maxsize=1024)
 
-        return self._walk(tail, data)
 
-    def find(self, data):
-        return self._walk(self.source, data)
+def compile(source, delim='.', allow_null=False):
+    """Returns a compiled `Path` for the `source`, shared via `PATH_CACHE`."""
+    key = (source, delim, allow_null)
+    compiled = PATH_CACHE.get(key)
+    if compiled is NULL:
+        compiled = PATH_CACHE.set(key, Path(source, delim, allow_null))
+    return compiled
 
 
-def find(source, data, dialect=None):
+def _check_dialect(dialect):
     if dialect not in DIALECTS:
         allowed = ', '.join([repr(d) for d in DIALECTS if d])
         msg = (
             "Dialect '{dialect}' is not supported; choose one of {allowed}."
         ).format(dialect=dialect, allowed=allowed)
         raise GenericError(msg)
+
+
+def finder(source, dialect=None):
+    """Returns `find(data)` callable for the `source` resolved once for
+    the `dialect`, which raises `NotFound` for missing values.
+    """
+    _check_dialect(dialect)
+    return COMPILERS[dialect](source)
+
+
+def getter(source, dialect=None):
+    """Same as `finder`, but returns `get(data, default=NULL)` callable
+    which returns `default` instead of raising `NotFound`. Fields keep
+    these after `bind()`.
+    """
+    _check_dialect(dialect)
+    return GETTERS[dialect](source)
+
+
+SourceInfo = namedtuple('SourceInfo', ['hits', 'misses', 'order'])
+
+
+# `jmespath` nodes which evaluate to `null` if their first child does
+_NULL_PROPAGATING = frozenset(['subexpression', 'index_expression', 'projection',
+                               'filter_projection', 'value_projection',
+                               'flatten'])
+
+
+def _root_key(get):
+    """Returns the key which `dict` data must have for the getter (see
+    `getter`) to find anything, or `None` if it is not known.
+    """
+    compiled = getattr(get, '__self__', None)
+    if isinstance(compiled, Path):
+        if compiled.steps and compiled.steps[0][0] is _step_key:
+            return compiled.steps[0][1]
+    elif isinstance(compiled, JMESPath):
+        node = compiled.expression.parsed
+        while node['type'] in _NULL_PROPAGATING:
+            node = node['children'][0]
+        if node['type'] == 'field':
+            return node['value']
+    return None
+
+
+class SourceStats(object):
+    """Hit statistics of multiple sources of an adaptive field, which tries
+    the sources found most often first.
+
+    Sources are reordered by hits after `warmup` lookups and then every
+    `interval` lookups. Declared priority is always kept: when a source is
+    found, the sources declared before it which are not tried yet are
+    looked up too. Those of them whose first key is missing in the data
+    are skipped by a cheap `in` check, so the reordering pays off for
+    sources with different first keys, the most for `jmespath` ones.
+    """
+
+    def __init__(self, sources, warmup=100, interval=1024):
+        self.sources = list(sources)
+        self.warmup = warmup
+        self.interval = interval
+        self.hits = [0] * len(self.sources)
+        self.misses = 0
+        self.lookups = 0
+        self.roots = None
+        self._set_order(list(range(len(self.sources))))
+
+    def _set_order(self, order):
+        self.order = order
+        # Sources declared before each source of the order and not tried
+        # before it, which are checked when it is found
+        self.earlier = [[j for j in range(i) if j not in order[:n]]
+                        for n, i in enumerate(order)]
+
+    def find(self, getters, data):
+        self.lookups += 1
+        if self.lookups == self.warmup or not self.lookups % self.interval:
+            self.reorder()
+
+        roots = self.roots
+        if roots is None:
+            roots = self.roots = [_root_key(get) for get in getters]
+        hits = self.hits
+        for i, earlier in zip(self.order, self.earlier):
+            value = getters[i](data)
+            if value is NULL:
+                continue
+            for j in earlier:
+                if roots[j] is not None and type(data) is dict and \
+                        roots[j] not in data:
+                    continue
+                earlier_value = getters[j](data)
+                if earlier_value is not NULL:
+                    i, value = j, earlier_value
+                    break
+            hits[i] += 1
+            return value
+        self.misses += 1
+        return NULL
+
+    def reorder(self):
+        self._set_order(sorted(range(len(self.sources)),
+                               key=lambda i: (-self.hits[i], i)))
+
+    def info(self):
+        hits = dict(zip(self.sources, self.hits))
+        order = [self.sources[i] for i in self.order]
+        return SourceInfo(hits, self.misses, order)
+
+
+def find(source, data, dialect=None):
+    _check_dialect(dialect)
     return DIALECTS[dialect](source, data)
 
 
+_SIMPLE_SEGMENT = r'(?:[A-Za-z_][A-Za-z0-9_]*|-?[0-9]+|\?|"[^".]*")'
+_SIMPLE_SOURCE = re.compile(
+    r'^{seg}(?:\.{seg})*$'.format(seg=_SIMPLE_SEGMENT))
+
+
+def is_simple(source):
+    """Checks that `source` is a plain chain of keys, indexes and `?`, so
+    it can be resolved by the native `Path` walker.
+    """
+    return bool(_SIMPLE_SOURCE.match(source))
+
+
 def _best_find(src, data):
-    if jmespath:
-        return _jmespath_find(src, data)
-    else:
-        return _defatul_find(src, data)
+    return _best_compile(src)(data)
 
 
 def _defatul_find(src, data):
-    return Path(src).find(data)
+    return compile(src).find(data)
 
 
 def _jmespath_find(src, data):
-    assert jmespath, (
-        "`jmespath` is not installed. Use `pip install jmespath` command to "
-        "install this package."
-    )
-    value = jmespath.search(src, data)
-    # XXX: For `jmespath` it's impossible to detect that value equals to
-    # `None` or doesn't exist. So we throw `NotFound` error in both cases.
-    # Also `required=` and `null=` field parametes have the same meaning for
-    # the `jmespath` dialect.
-    if value is None:
-        raise NotFound(src)
-    return value
+    return compile_jmespath(src).find(data)
+
+
+class JMESPath(object):
+    """`jmespath` dialect expression, parsed once on construction."""
+
+    def __init__(self, source):
+        assert jmespath, (
+            "`jmespath` is not installed. Use `pip install jmespath` command "
+            "to install this package."
+        )
+        self.source = source
+        self.expression = jmespath.compile(source)
+
+    def get(self, data, default=NULL):
+        value = self.expression.search(data)
+        # XXX: For `jmespath` it's impossible to detect that value equals to
+        # `None` or doesn't exist. So we return `default` in both cases.
+        # Also `required=` and `null=` field parametes have the same meaning
+        # for the `jmespath` dialect.
+        if value is None:
+            return default
+        return value
+
+    def find(self, data):
+        value = self.get(data)
+        if value is NULL:
+            raise NotFound(self.source)
+        return value
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({source!r})'.format(cls_name=cls_name,
+                                               source=self.source)
+
+
+JMESPATH_CACHE = LRUCache(maxsize=1024)
+
+
+def compile_jmespath(source):
+    """Returns a compiled `JMESPath` for the `source`, shared via
+    `JMESPATH_CACHE`.
+    """
+    compiled = JMESPATH_CACHE.get(source)
+    if compiled is NULL:
+        compiled = JMESPATH_CACHE.set(source, JMESPath(source))
+    return compiled
+
+
+def cache_info():
+    """Returns hits/misses statistics of the compiled expressions caches."""
+    return {
+        'default': PATH_CACHE.info(),
+        'jmespath': JMESPATH_CACHE.info(),
+    }
+
+
+def clear_caches():
+    PATH_CACHE.clear()
+    JMESPATH_CACHE.clear()
 
 
 DIALECTS = {
     None: _best_find,
+    'auto': _best_find,
     'default': _defatul_find,
     'jmespath': _jmespath_find,
 }
+
+
+def _best_compiled(src):
+    # Auto routing: simple sources go to the native walker, everything else
+    # (filters, projections, functions, etc.) to `jmespath` if available.
+    # Both routes treat missing and `None` values the same way.
+    if jmespath and not is_simple(src):
+        return compile_jmespath(src)
+    else:
+        return compile(src)
+
+
+def _best_compile(src):
+    return _best_compiled(src).find
+
+
+COMPILERS = {
+    None: _best_compile,
+    'auto': _best_compile,
+    'default': lambda src: compile(src).find,
+    'jmespath': lambda src: compile_jmespath(src).find,
+}
+
+
+GETTERS = {
+    None: lambda src: _best_compiled(src).get,
+    'auto': lambda src: _best_compiled(src).get,
+    'default': lambda src: compile(src).get,
+    'jmespath': lambda src: compile_jmespath(src).get,
+}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import Mapping
+from .exceptions import ValidationError
+
+
+__all__ = ['Record', 'record_class', 'LazyRecord']
+
+
+# Record classes by names and fields, so unpickled records share classes
+_RECORD_CLASSES = {}
+
+_RECORD_TEMPLATE = '''\
+class {name}(Record):
+    __slots__ = {fields!r}
+    _fields = {fields!r}
+
+    def __init__(self, {args}):
+{assignments}
+'''
+
+
+class Record(object):
+    """Base class of the `__slots__` classes of parsed documents, see
+    `record_class`.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def _asdict(self):
+        return dict((name, getattr(self, name)) for name in self._fields)
+
+    def __getitem__(self, name):
+        if name not in self._fields:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self._fields)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __reduce__(self):
+        cls = self.__class__
+        values = tuple(getattr(self, name) for name in self._fields)
+        return _make_record, (cls.__name__, self._fields, values)
+
+    def __repr__(self):
+        values = ', '.join(['{name}={value!r}'.format(
+                            name=name, value=getattr(self, name))
+                            for name in self._fields])
+        return '{cls_name}({values})'.format(
+            cls_name=self.__class__.__name__, values=values)
+
+
+def record_class(name, fields):
+    """Returns `Record` subclass called `name` with `fields` attributes
+    which are set by positional or keyword arguments of the constructor.
+    """
+    fields = tuple(str(f) for f in fields)
+    key = (name, fields)
+    if key not in _RECORD_CLASSES:
+        source = _RECORD_TEMPLATE.format(
+            name=name, fields=fields,
+            args=', '.join(fields),
+            assignments='\n'.join(['        self.{f} = {f}'.format(f=f)
+                                   for f in fields]) or '        pass')
+        namespace = {'Record': Record}
+        exec(compile(source, '<jsonobjects.records {name}>'.format(name=name),
+                     'exec'), namespace)
+        _RECORD_CLASSES[key] = namespace[name]
+    return _RECORD_CLASSES[key]
+
+
+def _make_record(name, fields, values):
+    return record_class(name, fields)(*values)
+
+
+class LazyRecord(Mapping):
+    """Parsed document which finds and validates each field of the
+    `schema` on the first access by name or attribute and keeps the value.
+    Use `validate_all` to validate the rest of fields.
+    """
+
+    __slots__ = ('_schema', '_data', '_values')
+
+    def __init__(self, schema, data):
+        self._schema = schema
+        self._data = data
+        self._values = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._run(name)
+        except ValidationError as e:
+            errors = [e.with_field_name(name)]
+            raise ValidationError(errors, self._schema.field_name)
+
+    def _run(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        value = self._schema.compiled_fields[name](self._data)
+        self._values[name] = value
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        return iter(self._schema.fields)
+
+    def __len__(self):
+        return len(self._schema.fields)
+
+    def validate_all(self):
+        """Validates all fields which are not accessed yet, including
+        fields of nested lazy records, raises `ValidationError` with errors
+        of all invalid fields. Returns the record itself.
+        """
+        errors = []
+        for name in self._schema.fields:
+            try:
+                _validate_all(self._run(name))
+            except ValidationError as e:
+                errors.append(e.with_field_name(name))
+                if len(errors) == self._schema.errors_limit:
+                    break
+        if errors:
+            raise ValidationError(errors, self._schema.field_name)
+        return self
+
+    def __reduce__(self):
+        # The schema is not sent along, so the record is fully validated
+        return dict, (dict(self.validate_all()),)
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return '{cls_name}({schema}, parsed={names!r})'.format(
+            cls_name=cls_name, schema=self._schema.__class__.__name__,
+            names=sorted(self._values))
+
+
+def _validate_all(value):
+    if isinstance(value, LazyRecord):
+        value.validate_all()
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _validate_all(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _validate_all(v)
@@ -1,16 +1,54 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import io
+import os
 import copy
+import mmap
+import multiprocessing
 from functools import wraps
-from .exceptions import ValidationError
-from .fields import Field
-from .utils import NULL
+from .columns import Column, Columns, column_typecode
+from .decoders import INVALID_JSON, get_decoder
+from .exceptions import GenericError, ValidationError
+from .fields import (
+    Field, DecimalField, _is_base, _is_coroutine_function, _is_coroutine_hook
+)
+from .parallel import (
+    create_pool, parse_chunk, parse_chunks, parse_shard, parse_shards,
+    split_file
+)
+from .records import LazyRecord, record_class
+from .stream import ALL, iter_array, load, loads, merge_projections
+from .utils import NULL, iter_lines, with_metaclass
 
 
 __all__ = ['Schema']
 
 
+ON_ERROR = ('raise', 'skip', 'collect')
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def _file_size(fileobj):
+    try:
+        return os.fstat(fileobj.fileno()).st_size
+    except (AttributeError, IOError, OSError, ValueError):
+        return 0
+
+
+def walk_fields(field):
+    """Yields the `field` and all fields nested into it."""
+    yield field
+    if isinstance(field, Schema):
+        children = list(field.fields.values())
+    else:
+        children = [getattr(field, 'child', None)]
+    for child in children:
+        if isinstance(child, Field):
+            for f in walk_fields(child):
+                yield f
+
+
 class SchemaMetaClass(type):
 
     @classmethod
@@ -32,56 +70,606 @@ class SchemaMetaClass(type):
         return super(SchemaMetaClass, mcs).__new__(mcs, name, bases, attrs)
 
 
-class Schema(Field):
-
-    __metaclass__ = SchemaMetaClass
+class Schema(with_metaclass(SchemaMetaClass, Field)):
 
     result_factory = NULL
+    # Whether documents are parsed into `record_class` instances instead
+    # of `dict`s, `None` means the same as the parent schema
+    record = None
+    # Whether documents are parsed into `LazyRecord`s, which validate
+    # fields on the first access, `None` means the same as the parent schema
+    lazy = None
+    # Number of invalid fields after which validation of the document
+    # stops, `None` means the same as the parent schema
+    max_errors = None
+    # Whether documents come from a trusted source, so values of the exact
+    # types of fields are taken as is and validators are skipped, except
+    # for the `validate_fraction` of documents which are fully validated
+    trusted = False
+    validate_fraction = None
 
     def __init__(self, source=None, **kwargs):
         result_factory = kwargs.pop('result_factory', NULL)
         self.result_factory = result_factory or self.result_factory
+        if kwargs.pop('fail_fast', False):
+            kwargs.setdefault('max_errors', 1)
+        for option in ('record', 'lazy', 'max_errors', 'trusted',
+                       'validate_fraction'):
+            value = kwargs.pop(option, None)
+            if value is not None:
+                setattr(self, option, value)
         super(Schema, self).__init__(source=source, **kwargs)
 
+    # Attributes computed from the fields, which copies compute again
+    _cached_attributes = ('_fields', '_record_class', '_compiled',
+                          '_compiled_row', '_compiled_fields', '_projection',
+                          '_use_decimal', '_is_async')
+
     @property
     def fields(self):
+        """Bound fields of this instance, which may be modified without
+        affecting other instances.
+
+        Declared fields are deep copied and bound once per schema class and
+        combination of `is_record`, `is_lazy` and `errors_limit`. Each
+        instance then takes cheap copies of those prototypes, see
+        `Field.bound_copy`.
+        """
         if not hasattr(self, '_fields'):
-            self._fields = {}
-            declared_fields = copy.deepcopy(self._declared_fields)
-            for name, field in declared_fields.items():
-                field.bind(name, self)
-                self._fields[name] = field
+            cls = self.__class__
+            # Not inherited from base classes
+            if '_prototypes' not in cls.__dict__:
+                cls._prototypes = {}
+            prototypes = cls._prototypes
+            key = (self.is_record, self.is_lazy, self.errors_limit)
+            if key not in prototypes:
+                fields = {}
+                declared_fields = copy.deepcopy(self._declared_fields)
+                for name, field in declared_fields.items():
+                    # No parent, so the class doesn't keep this instance
+                    # alive; the copies are bound to their instances
+                    field.bind(name, None)
+                    fields[name] = field
+                prototypes[key] = fields
+            self._fields = dict((name, field.bound_copy(self))
+                                for name, field in prototypes[key].items())
         return self._fields
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Generated functions can't be pickled, workers compile their own
+        for name in ('_compiled', '_compiled_row', '_compiled_fields'):
+            state.pop(name, None)
+        return state
+
+    def bound_copy(self, parent):
+        field = super(Schema, self).bound_copy(parent)
+        for name in self._cached_attributes:
+            field.__dict__.pop(name, None)
+        return field
+
     def find(self, data):
         if not self.source:
             return data
         return super(Schema, self).find(data)
 
+    def get_projection(self):
+        if not _is_base(self, 'convert_to_type', Schema):
+            return ALL
+        projection = {}
+        for _, field in self.fields.items():
+            projection = merge_projections(projection,
+                                           field.get_source_projection())
+        return projection
+
+    def get_source_projection(self):
+        if not _is_base(self, 'find', Schema):
+            return ALL
+        if not self.source:
+            return self.get_projection()
+        return self._getters_projection()
+
+    def run_field(self, field, value):
+        """Finds the `field` in the `value` and validates it, including the
+        `validate_<name>` method of the schema.
+        """
+        validate_method = getattr(self, 'validate_' + field.field_name, None)
+        raw_value = field.find(value)
+        validated_value = field.run_validation(raw_value)
+        if validate_method is not None:
+            validated_value = validate_method(validated_value)
+        return validated_value
+
     def convert_to_type(self, value):
+        if self.is_lazy:
+            result = LazyRecord(self, value)
+            if self.result_factory is not NULL:
+                result = self.result_factory(result)
+            return result
+
         result = {}
         errors = []
+        limit = self.errors_limit
         for _, field in self.fields.items():
-            validate_method = getattr(self, 'validate_' + field.field_name, None)
-            raw_value = field.find(value)
             try:
-                validated_value = field.run_validation(raw_value)
-                if validate_method is not None:
-                    validated_value = validate_method(validated_value)
+                validated_value = self.run_field(field, value)
             except ValidationError as e:
-                errors.append(ValidationError(e.messages, field.field_name))
+                errors.append(e.with_field_name(field.field_name))
+                if len(errors) == limit:
+                    break
             else:
                 result[field.field_name] = validated_value
 
         if errors:
             raise ValidationError(errors, self.field_name)
 
+        if self.is_record:
+            result = self.record_class(**result)
+
         if self.result_factory is not NULL:
             result = self.result_factory(result)
 
         return result
 
+    def _inherited(self, option):
+        field = self
+        while field is not None:
+            if isinstance(field, Schema) and \
+                    getattr(field, option) is not None:
+                return getattr(field, option)
+            field = field.parent
+        return False
+
+    @property
+    def is_record(self):
+        """Whether documents are parsed into `record_class` instances."""
+        return self._inherited('record')
+
+    @property
+    def is_lazy(self):
+        """Whether documents are parsed into `records.LazyRecord`s."""
+        return self._inherited('lazy')
+
+    @property
+    def errors_limit(self):
+        """Number of invalid fields after which validation stops or `None`,
+        see `max_errors`.
+        """
+        return self._inherited('max_errors') or None
+
+    @property
+    def record_class(self):
+        """`records.Record` class with `__slots__` for the fields, ordered
+        by names.
+        """
+        if not hasattr(self, '_record_class'):
+            name = self.__class__.__name__ + 'Record'
+            self._record_class = record_class(name, sorted(self.fields))
+        return self._record_class
+
+    def compile(self):
+        """Returns a function equivalent to `parse`, but generated
+        specifically for the bound fields of this schema. Changes of the
+        fields made after the compilation are not reflected.
+
+        Parsers of `trusted` schemas with `validate_fraction` are
+        `compiler.SampledParser`s.
+        """
+        from .compiler import SampledParser, compile_schema
+        if not self.trusted:
+            return compile_schema(self)
+        parse = compile_schema(self, trusted=True)
+        if self.validate_fraction:
+            parse = SampledParser(parse, compile_schema(self),
+                                  self.validate_fraction)
+        return parse
+
+    def trust_info(self):
+        """Returns `compiler.TrustInfo` with numbers of documents parsed by
+        `compiled`, validated ones of them and invalid ones of those, or
+        `None` if documents are not sampled.
+        """
+        info = getattr(self.compiled, 'info', None)
+        return info() if info is not None else None
+
+    def parse(self, data):
+        assert not self.is_async, (
+            'Schemas with coroutine hooks are parsed by `aparse` only.'
+        )
+        if self.trusted:
+            return self.compiled(data)
+        return self.run_validation(self.find(data))
+
+    @property
+    def compiled(self):
+        """Compiled `parse` shared by the bulk parsing methods."""
+        if not hasattr(self, '_compiled'):
+            assert not self.is_async, (
+                'Schemas with coroutine hooks are parsed by `aparse` only.'
+            )
+            self._compiled = self.compile()
+        return self._compiled
+
+    @property
+    def compiled_row(self):
+        """Compiled parser of documents into tuples, see `parse_columns`."""
+        if not hasattr(self, '_compiled_row'):
+            assert not self.is_async, (
+                'Schemas with coroutine hooks are parsed by `aparse` only.'
+            )
+            from .compiler import compile_row
+            self._compiled_row = compile_row(self)
+        return self._compiled_row
+
+    @property
+    def compiled_fields(self):
+        """Compiled `run_field` of each field by names, see `LazyRecord`."""
+        if not hasattr(self, '_compiled_fields'):
+            assert not self.is_async, (
+                'Schemas with coroutine hooks are parsed by `aparse` only.'
+            )
+            from .compiler import compile_fields
+            self._compiled_fields = compile_fields(self)
+        return self._compiled_fields
+
+    @property
+    def projection(self):
+        """Projection of documents parsed by the schema, see `stream.ALL`."""
+        if not hasattr(self, '_projection'):
+            self._projection = self.get_source_projection()
+        return self._projection
+
+    @property
+    def use_decimal(self):
+        """Whether floats should be decoded as `decimal.Decimal`, that is
+        the schema has `DecimalField`s. All floats of the document are
+        decoded so, then other fields get `Decimal` values too: e.g. `Field`
+        returns them as is and `StringField` converts `1e2` to `'1E+2'`.
+        """
+        if not hasattr(self, '_use_decimal'):
+            self._use_decimal = any(isinstance(f, DecimalField)
+                                    for f in walk_fields(self))
+        return self._use_decimal
+
+    @property
+    def is_async(self):
+        """Whether the schema has coroutine validators, post processors or
+        `validate_<name>` methods, which are awaited by `aparse` only.
+        """
+        if not hasattr(self, '_is_async'):
+            hooks = []
+            for field in walk_fields(self):
+                hooks.extend(field.validators)
+                hooks.extend(field.post_process)
+                if isinstance(field, Schema):
+                    hooks.extend(getattr(field, 'validate_' + name, None)
+                                 for name in field.fields)
+            self._is_async = any(_is_coroutine_hook(h) for h in hooks)
+        return self._is_async
+
+    def parse_json(self, data, project=False, decoder=None, use_decimal=None):
+        """Decodes JSON `data` (`bytes`, text, `bytearray` or `memoryview`)
+        and parses it.
+
+        `decoder` is one of `decoders.DECODERS`, by default the fastest
+        installed one. Floats are decoded as `decimal.Decimal` if the schema
+        has `DecimalField`s unless `use_decimal` is given, see
+        `use_decimal` for how it affects other fields. Documents rejected by
+        the default decoder are decoded by `json`, see
+        `decoders.get_decoder`.
+
+        With `project=True` values which are never looked up by the schema
+        are skipped while decoding instead of being materialized. It saves
+        memory for documents mostly made of such values, but the decoding
+        is driven by Python code and so is usually slower. Skipped values are
+        not validated, so some malformed JSON in them is accepted.
+        """
+        if use_decimal is None:
+            use_decimal = self.use_decimal
+        try:
+            if project:
+                data = loads(data, self.projection, use_decimal)
+            else:
+                data = get_decoder(decoder, use_decimal).loads(data,
+                                                               use_decimal)
+        except (ValueError, GenericError) as e:
+            raise ValidationError(INVALID_JSON.format(error=e))
+        return self.compiled(data)
+
+    def parse_file(self, file, project=False, decoder=None, use_decimal=None):
+        """Reads JSON document from the `file` (path or binary file object)
+        and parses it, see `parse_json`.
+
+        Large files are memory mapped if the decoder can read them without
+        copying, with `project=True` the file is read by chunks.
+        """
+        if not hasattr(file, 'read'):
+            with open(file, 'rb') as fileobj:
+                return self.parse_file(fileobj, project, decoder, use_decimal)
+
+        if use_decimal is None:
+            use_decimal = self.use_decimal
+        if project:
+            try:
+                data = load(file, self.projection, use_decimal)
+            except (ValueError, GenericError) as e:
+                raise ValidationError(INVALID_JSON.format(error=e))
+            return self.compiled(data)
+
+        buffers = get_decoder(decoder, use_decimal).buffers
+        if buffers and _file_size(file) >= MMAP_THRESHOLD:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                return self.parse_json(view, False, decoder, use_decimal)
+            finally:
+                view.release()
+                mapped.close()
+        return self.parse_json(file.read(), False, decoder, use_decimal)
+
+    def parse_many(self, iterable, on_error='raise', workers=None,
+                   executor=None, chunk_size=256):
+        """Parses each item of the `iterable`.
+
+        `on_error` defines what to do with invalid items: 'raise' the
+        `ValidationError` (with `index` of the item set), 'skip' them or
+        'collect' them, in which case `(results, errors)` is returned where
+        `errors` is a list of `(index, ValidationError)` pairs.
+
+        With `workers` > 1 items are parsed in so many processes by chunks
+        of `chunk_size` items, the order of results is preserved. Pass
+        `executor` created by `create_pool` to reuse the processes.
+        """
+        assert on_error in ON_ERROR, (
+            '`on_error` should be one of {allowed}.'
+        ).format(allowed=', '.join([repr(e) for e in ON_ERROR]))
+
+        if executor is None and workers is not None and workers > 1:
+            pool = self.create_pool(workers)
+            try:
+                return self.parse_many(iterable, on_error, executor=pool,
+                                       chunk_size=chunk_size)
+            finally:
+                pool.terminate()
+                pool.join()
+
+        if executor is not None:
+            chunks = parse_chunks(executor, iterable, on_error, chunk_size)
+        else:
+            chunks = [parse_chunk(self.compiled, 0, iterable, on_error)]
+
+        results = []
+        errors = []
+        for chunk_results, chunk_errors in chunks:
+            if chunk_errors and on_error == 'raise':
+                raise chunk_errors[0][1]
+            results.extend(chunk_results)
+            errors.extend(chunk_errors)
+
+        if on_error == 'collect':
+            return results, errors
+        return results
+
+    def parse_columns(self, iterable, on_error='raise', chunk_size=1024):
+        """Parses each item of the `iterable` into `columns.Columns`, which
+        store values of each field in a compact `array.array` (for boolean,
+        integer and float fields) or a `list` with a validity bitmap of
+        `None` values, instead of a `dict` per item.
+
+        `result_factory` of the schema is not applied. `on_error` is the
+        same as for `parse_many`. Columns are filled by chunks of
+        `chunk_size` items.
+        """
+        assert on_error in ON_ERROR, (
+            '`on_error` should be one of {allowed}.'
+        ).format(allowed=', '.join([repr(e) for e in ON_ERROR]))
+
+        row = self.compiled_row
+        columns = Columns([Column(field.field_name, column_typecode(field))
+                           for _, field in self.fields.items()])
+        rows = []
+        append = rows.append
+        errors = []
+        for index, data in enumerate(iterable):
+            try:
+                append(row(data))
+            except ValidationError as e:
+                e.index = index
+                if on_error == 'raise':
+                    raise
+                errors.append((index, e))
+            if len(rows) == chunk_size:
+                columns.extend(rows)
+                del rows[:]
+        columns.extend(rows)
+
+        if on_error == 'collect':
+            return columns, errors
+        return columns
+
+    def iter_parse_shards(self, path, workers=None, shards=None,
+                          ordered=True, on_error='raise', executor=None,
+                          decoder=None, use_decimal=None):
+        """Parses newline delimited JSON file by byte ranges (`shards`, by
+        default one per worker) aligned on line boundaries. Each worker maps
+        the file into memory and reads its range itself, so no input is
+        sent between processes.
+
+        Yields `parallel.Shard`s with results, errors and timings in the
+        order of ranges or, with `ordered=False`, as soon as they are
+        parsed. Errors have `offset` in the file set; `index` and `line`
+        are absolute for ordered shards and relative to the shard otherwise.
+        With 'raise' `on_error` the first error is raised.
+        """
+        assert on_error in ON_ERROR, (
+            '`on_error` should be one of {allowed}.'
+        ).format(allowed=', '.join([repr(e) for e in ON_ERROR]))
+
+        if use_decimal is None:
+            use_decimal = self.use_decimal
+        workers = workers or multiprocessing.cpu_count()
+        shards = shards or workers
+
+        if executor is None and workers > 1:
+            pool = self.create_pool(workers)
+            try:
+                for shard in self.iter_parse_shards(
+                        path, workers, shards, ordered, on_error, pool,
+                        decoder, use_decimal):
+                    yield shard
+            finally:
+                pool.terminate()
+                pool.join()
+            return
+
+        if executor is not None:
+            results = parse_shards(executor, path, shards, on_error,
+                                   decoder, use_decimal, ordered)
+        else:
+            loads = get_decoder(decoder, use_decimal).loads
+            results = (parse_shard(self.compiled,
+                                   lambda line: loads(line, use_decimal),
+                                   path, index, start, end, on_error)
+                       for index, (start, end)
+                       in enumerate(split_file(path, shards)))
+
+        records = lines = 0
+        for shard in results:
+            if ordered:
+                for _, e in shard.errors:
+                    e.index += records
+                    e.line += lines
+                shard.errors = [(e.index, e) for _, e in shard.errors]
+                records += len(shard.results) + len(shard.errors)
+                lines += shard.lines
+            if shard.errors and on_error == 'raise':
+                raise shard.errors[0][1]
+            if on_error == 'skip':
+                shard.errors = []
+            yield shard
+
+    def parse_shards(self, path, workers=None, ordered=True,
+                     on_error='raise', **kwargs):
+        """Parses newline delimited JSON file with `iter_parse_shards` and
+        merges results of the shards, returns them as `parse_many` does.
+        """
+        results = []
+        errors = []
+        for shard in self.iter_parse_shards(path, workers, ordered=ordered,
+                                            on_error=on_error, **kwargs):
+            results.extend(shard.results)
+            errors.extend(shard.errors)
+
+        if on_error == 'collect':
+            return results, errors
+        return results
+
+    def create_pool(self, workers=None, context=None):
+        """Returns a pool of processes for `parse_many`, see
+        `parallel.create_pool`.
+        """
+        return create_pool(self, workers, context)
+
+    def iter_parse_lines(self, fileobj, on_error='raise',
+                         chunk_size=1024 * 1024, decoder=None,
+                         use_decimal=None):
+        """Lazily parses newline delimited JSON documents from the binary
+        `fileobj`, reading it by `chunk_size` bytes.
+
+        Errors (including malformed JSON) have `index`, `line` and `offset`
+        set. `on_error` is 'raise', 'skip' or 'collect', in which case the
+        `ValidationError` is yielded in place of the result. `decoder` and
+        `use_decimal` are the same as for `parse_json`.
+        """
+        if use_decimal is None:
+            use_decimal = self.use_decimal
+        loads = get_decoder(decoder, use_decimal).loads
+
+        def records():
+            for lineno, offset, line in iter_lines(fileobj, chunk_size):
+                try:
+                    data = loads(line, use_decimal)
+                except ValueError as e:
+                    data = ValidationError(INVALID_JSON.format(error=e))
+                yield data, {'line': lineno, 'offset': offset}
+
+        return self._iter_parse(records(), on_error)
+
+    def iter_parse_array(self, fileobj, source=None, on_error='raise',
+                         chunk_size=64 * 1024):
+        """Lazily parses items of a JSON array found by the default dialect
+        `source` (e.g. 'results') in the document read from `fileobj` (or
+        `bytes`), keeping in memory only one item at a time.
+
+        `on_error` is the same as for `iter_parse_lines`, errors have `index`
+        of the item set.
+        """
+        if isinstance(fileobj, bytes):
+            fileobj = io.BytesIO(fileobj)
+
+        def records():
+            for data in iter_array(fileobj, source, chunk_size,
+                                   self.use_decimal):
+                yield data, {}
+
+        return self._iter_parse(records(), on_error)
+
+    def _iter_parse(self, records, on_error):
+        assert on_error in ON_ERROR, (
+            '`on_error` should be one of {allowed}.'
+        ).format(allowed=', '.join([repr(e) for e in ON_ERROR]))
+
+        parse = self.compiled
+        for index, (data, attrs) in enumerate(records):
+            try:
+                if isinstance(data, ValidationError):
+                    raise data
+                result = parse(data)
+            except ValidationError as e:
+                e.index = index
+                for name, value in attrs.items():
+                    setattr(e, name, value)
+                if on_error == 'raise':
+                    raise
+                if on_error == 'collect':
+                    yield e
+            else:
+                yield result
+
+    def aparse(self, data, executor=None, concurrency=None):
+        """Coroutine parsing the `data` in the `executor`, if it is given,
+        so large documents don't block the event loop. The `executor` is
+        `concurrent.futures.ThreadPoolExecutor` or a pool of processes
+        created by `create_pool`. Requires Python 3.6+.
+
+        Validators, post processors and `validate_<name>` methods may be
+        coroutine functions (see `is_async`), such hooks of all the fields
+        and list items are awaited concurrently, at most `concurrency` at
+        once if it is given.
+        """
+        from .aio import aparse
+        return aparse(self, data, executor, concurrency)
+
+    def aiter_parse_lines(self, reader, on_error='raise', decoder=None,
+                          use_decimal=None, concurrency=None):
+        """Asynchronous version of `iter_parse_lines` reading from the
+        `asyncio.StreamReader`. Lines are read one by one, so the transport
+        is paused while the consumer is busy. Lines longer than the limit
+        of the reader are read by parts. Requires Python 3.6+.
+        """
+        assert on_error in ON_ERROR, (
+            '`on_error` should be one of {allowed}.'
+        ).format(allowed=', '.join([repr(e) for e in ON_ERROR]))
+
+        from .aio import aiter_parse_lines
+        return aiter_parse_lines(self, reader, on_error, decoder, use_decimal,
+                                 concurrency)
+
     def as_decorator(self, func):
+        if _is_coroutine_function(func):
+            from .aio import as_decorator
+            return as_decorator(self, func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             return self.parse(func(*args, **kwargs))
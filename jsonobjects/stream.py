@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import re
+import json
+import codecs
+import decimal
+from .exceptions import GenericError, NotFound
+from .decoders import to_buffer
+from .utils import NULL
+from .path import Path, compile as compile_path, _step_index, _step_any
+
+
+__all__ = ['JSONStream', 'iter_array', 'load', 'loads', 'ALL', 'ANY',
+           'merge_projections', 'path_projection']
+
+
+# Projection tree is a `dict` of keys to the projections of their values.
+# `ALL` means that a value is required as is, `ANY` key matches any key.
+ALL = object()
+ANY = object()
+
+
+def merge_projections(a, b):
+    if a is ALL or b is ALL:
+        return ALL
+    merged = dict(a)
+    for k, v in b.items():
+        merged[k] = merge_projections(merged[k], v) if k in merged else v
+    # Keys which are also matched by `ANY` get both projections
+    if ANY in merged:
+        any_projection = merged[ANY]
+        for k, v in merged.items():
+            if k is not ANY:
+                merged[k] = merge_projections(v, any_projection)
+    return merged
+
+
+def path_projection(getter, projection):
+    """Wraps `projection` of a value found by the `getter` (see
+    `path.getter`) into the projection of the document.
+    """
+    compiled = getattr(getter, '__self__', None)
+    if not isinstance(compiled, Path):
+        return ALL
+    for evaluate, k in reversed(compiled.steps):
+        # Arrays are transparent for projections
+        if evaluate is _step_any:
+            projection = {ANY: projection}
+        elif evaluate is not _step_index:
+            projection = {k: projection}
+    return projection
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+_KEY = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,}])')
+_SIMPLE_SCALAR = re.compile(r'"[^"\\]*"|true|false|null|-?[0-9.eE+-]+')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+# Containers without nested containers and escaped strings
+_FLAT_CONTAINER = re.compile(
+    r'\[[^\[\]{}"]*(?:"[^"\\]*"[^\[\]{}"]*)*\]|'
+    r'\{[^\[\]{}"]*(?:"[^"\\]*"[^\[\]{}"]*)*\}')
+
+
+class JSONStream(object):
+    """Incremental reader of a JSON document from a file object.
+
+    Keeps in memory only the part of the document which is being decoded,
+    so values can be skipped or materialized one by one.
+    """
+
+    def __init__(self, fileobj, chunk_size=64 * 1024, use_decimal=False):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder(
+            parse_float=decimal.Decimal if use_decimal else None)
+        self.buffer = u''
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+
+    def fill(self):
+        """Reads the next chunk and drops already consumed data."""
+        if self.eof:
+            return False
+        chunk = self.fileobj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            text = self.decoder.decode(b'', True)
+        elif isinstance(chunk, bytes):
+            text = self.decoder.decode(chunk)
+        else:
+            text = chunk
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return not self.eof
+
+    def error(self, msg):
+        raise GenericError('{msg} at position {pos}.'.format(
+            msg=msg, pos=self.consumed + self.pos))
+
+    def peek(self):
+        """Returns the next non whitespace character or '' at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            self.error('Expected one of {chars!r}'.format(chars=chars))
+        self.pos += 1
+        return c
+
+    def is_complete(self, end):
+        """Returns whether the value decoded up to `end` can't continue in
+        the next chunk, e.g. `12` of `12.5` or `1` of `1e3`.
+        """
+        return self.eof or \
+            _NUMBER_TAIL.match(self.buffer, end).end() < len(self.buffer)
+
+    def decode(self):
+        """Materializes the next value."""
+        try:
+            value, end = self.json.raw_decode(self.buffer, self.pos)
+        except ValueError:
+            pass
+        else:
+            if self.is_complete(end):
+                self.pos = end
+                return value
+
+        if not self.peek():
+            self.error('Unexpected end of data')
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                end = None
+            # Numbers (and broken values) can continue in the next chunk
+            if end is not None and self.is_complete(end):
+                self.pos = end
+                return value
+            if self.eof:
+                self.error('Invalid JSON value')
+            # Grow the buffer geometrically to keep retries cheap
+            size = 2 * (len(self.buffer) - self.pos) or self.chunk_size
+            while self.fill() and len(self.buffer) - self.pos < size:
+                pass
+
+    def skip(self):
+        """Skips the next value without materializing containers.
+
+        Skipped values are only scanned for their end, so they are not
+        validated: e.g. a malformed number like `1.2.3` or a broken literal
+        inside a skipped container is accepted.
+        """
+        if self.peek() not in '[{':
+            m = _SIMPLE_SCALAR.match(self.buffer, self.pos)
+            # Numbers can continue in the next chunk
+            if m is not None and m.end() < len(self.buffer):
+                self.pos = m.end()
+            else:
+                self.decode()
+            return
+
+        m = _FLAT_CONTAINER.match(self.buffer, self.pos)
+        if m is not None:
+            self.pos = m.end()
+            return
+
+        # Decoding by the C scanner and dropping the value is faster than
+        # scanning in Python when the whole value is already buffered
+        try:
+            _, end = self.json.raw_decode(self.buffer, self.pos)
+        except ValueError:
+            pass
+        else:
+            self.pos = end
+            return
+
+        depth = 0
+        while True:
+            m = _STRUCTURE.search(self.buffer, self.pos)
+            if m is None:
+                self.pos = len(self.buffer)
+                if not self.fill():
+                    self.error('Unexpected end of data')
+                continue
+
+            self.pos = m.end()
+            c = m.group()
+            if c == '"':
+                self.skip_string()
+            elif c in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def skip_string(self):
+        # The opening quote is already consumed
+        while True:
+            m = _STRING_END.search(self.buffer, self.pos)
+            if m is None:
+                self.pos = len(self.buffer)
+            elif m.group() == '"':
+                self.pos = m.end()
+                return
+            elif m.end() < len(self.buffer):
+                self.pos = m.end() + 1
+                continue
+            else:
+                self.pos = m.start()
+            if not self.fill():
+                self.error('Unexpected end of data')
+
+    def project(self, projection):
+        """Materializes the next value leaving out of objects keys which are
+        not in the `projection`.
+        """
+        if projection is ALL:
+            return self.decode()
+
+        c = self.peek()
+        if c == '[':
+            self.pos += 1
+            result = []
+            if self.peek() == ']':
+                self.pos += 1
+                return result
+            while True:
+                result.append(self.project(projection))
+                if self.expect(',]') == ']':
+                    return result
+
+        if c != '{':
+            return self.decode()
+
+        self.pos += 1
+        result = {}
+        if self.peek() == '}':
+            self.pos += 1
+            return result
+        any_projection = projection.get(ANY)
+        dropped = NULL
+        while True:
+            m = _KEY.match(self.buffer, self.pos)
+            if m is not None:
+                key = m.group(1)
+                self.pos = m.end()
+            else:
+                key = self.decode()
+                self.expect(':')
+
+            value_projection = projection.get(key, any_projection)
+            if value_projection is None:
+                self.skip()
+                dropped = key
+            elif value_projection is ALL:
+                result[key] = self.decode()
+            else:
+                result[key] = self.project(value_projection)
+
+            m = _SEPARATOR.match(self.buffer, self.pos)
+            if m is not None:
+                self.pos = m.end()
+                c = m.group(1)
+            else:
+                c = self.expect(',}')
+            if c == '}':
+                break
+        # Keep emptiness of the object for blank values validation
+        if not result and dropped is not NULL:
+            result[dropped] = None
+        return result
+
+    def seek(self, source):
+        """Moves to the value found by the default dialect `source`."""
+        for evaluate, k in compile_path(source).steps:
+            if evaluate is _step_index:
+                if self.peek() != '[' or k < 0:
+                    raise NotFound(source)
+                self.pos += 1
+                for _ in range(k):
+                    if self.peek() == ']':
+                        raise NotFound(source)
+                    self.skip()
+                    self.expect(',]')
+                if self.peek() == ']':
+                    raise NotFound(source)
+            else:
+                if self.peek() != '{':
+                    raise NotFound(source)
+                self.pos += 1
+                while True:
+                    if self.peek() == '}':
+                        raise NotFound(source)
+                    key = self.decode()
+                    self.expect(':')
+                    if evaluate is _step_any or key == k:
+                        break
+                    self.skip()
+                    if self.expect(',}') == '}':
+                        raise NotFound(source)
+
+    def items(self):
+        """Materializes items of the array one by one."""
+        if self.peek() != '[':
+            self.error('Expected an array')
+        self.pos += 1
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_array(fileobj, source=None, chunk_size=64 * 1024, use_decimal=False):
+    """Yields items of the array found by the default dialect `source` (or
+    the top level array) in the JSON document read from `fileobj`.
+    """
+    stream = JSONStream(fileobj, chunk_size, use_decimal)
+    if source:
+        stream.seek(source)
+    return stream.items()
+
+
+def load(fileobj, projection=ALL, use_decimal=False, chunk_size=64 * 1024):
+    """Decodes JSON document read from `fileobj` with the `projection`."""
+    stream = JSONStream(fileobj, chunk_size, use_decimal)
+    value = stream.project(projection)
+    if stream.peek():
+        stream.error('Extra data')
+    return value
+
+
+def loads(data, projection=ALL, use_decimal=False):
+    """Decodes JSON `data` (`bytes` or text) with the `projection`."""
+    data = to_buffer(data)
+    fileobj = io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+    return load(fileobj, projection, use_decimal, max(len(data), 1))
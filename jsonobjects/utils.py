@@ -1,12 +1,29 @@
 # -*- coding: utf-8 -*-
 
 
+import sys
+from collections import OrderedDict, namedtuple
+
+
 __all__ = ['NULL', 'ISO_8601', 'unicode_type', 'basestring_type',
            'utf8', 'to_unicode',
-           'is_non_str_iterable', 'to_iterable', 'smart_bool']
+           'is_non_str_iterable', 'to_iterable', 'smart_bool', 'LRUCache',
+           'iter_lines', 'with_metaclass', 'intern_string']
+
+
+class _Null(object):
+    """Type of the `NULL` sentinel, which stays the same object when it is
+    pickled, e.g. with schemas sent to `spawn` worker processes.
+    """
+
+    def __reduce__(self):
+        return 'NULL'
 
+    def __repr__(self):
+        return 'NULL'
 
-NULL = object()
+
+NULL = _Null()
 ISO_8601 = 'iso-8601'
 
 
@@ -17,10 +34,34 @@ else:
     unicode_type = unicode
     basestring_type = basestring
 
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern
+
+
+def with_metaclass(meta, *bases):
+    """Creates a base class with the `meta` metaclass for both Python 2
+    and 3 syntax of class definitions.
+    """
+    class metaclass(meta):
+        def __new__(mcs, name, this_bases, attrs):
+            return meta(name, bases, attrs)
+    return type.__new__(metaclass, 'temporary_class', (), {})
+
 
 _UTF8_TYPES = (bytes, type(None))
 
 
+def intern_string(value):
+    """Interns `str` values, so equal strings share storage. Other values
+    (including `unicode` on Python 2) are returned unchanged.
+    """
+    if type(value) is str:
+        return _intern(value)
+    return value
+
+
 def utf8(value, errors='strict'):
     """Converts a string argument to a byte string.
     If the argument is already a byte string or None, it is returned unchanged.
@@ -71,3 +112,90 @@ def smart_bool(v):
     except AttributeError:
         pass
     return bool(v)
+
+
+# Python 2 has no `OrderedDict.move_to_end`
+_MOVE_TO_END = hasattr(OrderedDict, 'move_to_end')
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """Bounded mapping which evicts the least recently used entries.
+    Counts hits and misses, see `info()`.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=NULL):
+        data = self._data
+        try:
+            value = data[key]
+            if _MOVE_TO_END:
+                data.move_to_end(key)
+            else:
+                data[key] = data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            try:
+                self._data.popitem(last=False)
+            except KeyError:
+                break
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def iter_lines(fileobj, chunk_size=1024 * 1024):
+    """Reads binary `fileobj` by chunks and yields `(lineno, offset, line)`
+    for each non blank line, where `offset` is the position of the line's
+    first byte in the file.
+    """
+    lineno = 0
+    offset = 0
+    # Chunks of the unfinished line, joined once its end is read, so long
+    # lines are not copied on every chunk
+    parts = []
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        lines = chunk.split(b'\n')
+        if len(lines) == 1:
+            parts.append(chunk)
+            continue
+        if parts:
+            parts.append(lines[0])
+            lines[0] = b''.join(parts)
+        parts = [lines.pop()]
+        for line in lines:
+            lineno += 1
+            if line.strip():
+                yield lineno, offset, line
+            offset += len(line) + 1
+    tail = b''.join(parts)
+    if tail.strip():
+        yield lineno + 1, offset, tail
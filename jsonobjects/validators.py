@@ -22,8 +22,7 @@ class BaseValidator(object):
     def validate(self, value):
         if not self.predicate(value):
             params = dict(self.params or {}, value=value)
-            message = self.message.format(**params)
-            raise ValidationError(message, self.field_name)
+            raise ValidationError(self.message, self.field_name, params)
         return value
 
     def __call__(self, value):
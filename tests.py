@@ -1,15 +1,25 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import io
+import os
+import gc
 import re
+import sys
 import copy
+import pickle
 import decimal
 import datetime
+import tempfile
+import weakref
 import unittest
+import multiprocessing
 from mock import MagicMock
 
 import jsonobjects as jo
+from jsonobjects import columns, dates, decoders
 from jsonobjects.fields import get_error_messages
+from jsonobjects.utils import iter_lines
 
 
 TEST_INPUT = {
@@ -52,6 +62,12 @@ class ItemSchema(jo.Schema):
     reviews = jo.ListField('reviews.top', child=ReviewSchema())
 
 
+class WorkerSchema(jo.Schema):
+    # Defined at the module level, so `spawn` workers can unpickle it
+    x = jo.IntegerField()
+    y = jo.IntegerField(required=False, default=None)
+
+
 class JsonObjectsTestCase(unittest.TestCase):
 
     def test_default_path(self):
@@ -65,6 +81,21 @@ class JsonObjectsTestCase(unittest.TestCase):
         self.assertRaises(jo.NotFound, jo.Path('x').find, {'x': None})
         self.assertEqual(jo.Path('x', allow_null=True).find({'x': None}), None)
 
+    def test_compiled_path(self):
+        data = {'x': {'y': [1, 2]}}
+        p = jo.path.compile('x.y.1')
+        self.assertIs(jo.path.compile('x.y.1'), p)
+        self.assertIsNot(jo.path.compile('x.y.1', allow_null=True), p)
+        self.assertEqual(len(p.steps), 3)
+        self.assertEqual(p.find(data), 2)
+        self.assertRaises(jo.NotFound, jo.path.compile('x.y.z').find, data)
+        self.assertRaises(jo.NotFound, jo.path.compile('x.y.z').find, {'x': 1})
+
+        f = jo.Field(dialect='default')
+        f.bind('x', jo.Field())
+        self.assertIsNotNone(f._getters)
+        self.assertEqual(f.parse(data), {'y': [1, 2]})
+
     def test_dialects(self):
         find = jo.path.find
         data = {'x': {'y': 1, 'z': [3, 4]}}
@@ -73,6 +104,63 @@ class JsonObjectsTestCase(unittest.TestCase):
         self.assertEqual(find('x.y', data, 'jmespath'), 1)
         self.assertRaises(jo.GenericError, find, 'x.y', data, 'dummy')
 
+    def test_auto_dialect(self):
+        is_simple = jo.path.is_simple
+        for src in ['x', 'x.y', 'results.0.name', 'x.-1', '?.y', 'x."1"']:
+            self.assertTrue(is_simple(src), src)
+        for src in ['x[0]', 'x[*].y', 'x | [0]', 'length(x)', "x.'1'",
+                    'x[?y > `1`]', '{a: x}', '']:
+            self.assertFalse(is_simple(src), src)
+
+        find = jo.path.find
+        data = {'x': {'y': None, 'z': [3, 4]}}
+        self.assertIsInstance(
+            jo.path.finder('x.z', 'auto').__self__, jo.Path)
+        self.assertIsInstance(
+            jo.path.finder('x.z[0]', 'auto').__self__, jo.path.JMESPath)
+        self.assertEqual(find('x.z.1', data, 'auto'), 4)
+        self.assertEqual(find('x.z[1]', data, 'auto'), 4)
+        for src in ['x.y', 'x.w', 'x.z.y', 'x.y.w', 'x.z[5]', 'x.w[0]']:
+            self.assertRaises(jo.NotFound, find, src, data, 'auto')
+
+    def test_compiled_jmespath(self):
+        jo.path.clear_caches()
+        data = {'x': {'y': 1, 'z': [3, 4]}}
+        expr = jo.path.compile_jmespath('x.z[-1]')
+        self.assertIs(jo.path.compile_jmespath('x.z[-1]'), expr)
+        self.assertEqual(expr.find(data), 4)
+        self.assertRaises(jo.NotFound, expr.find, {'x': None})
+        self.assertEqual(jo.path.find('x.z[-1]', data, 'jmespath'), 4)
+
+        info = jo.path.cache_info()['jmespath']
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_path_get(self):
+        data = {'x': {'y': [1, 2], 'n': None}}
+        default = object()
+        self.assertEqual(jo.Path('x.y.1').get(data), 2)
+        self.assertIs(jo.Path('x.z').get(data), jo.utils.NULL)
+        self.assertIs(jo.Path('x.y.5').get(data, default), default)
+        self.assertIs(jo.Path('x.n').get(data, default), default)
+        self.assertIsNone(jo.Path('x.n', allow_null=True).get(data, default))
+
+        expr = jo.path.compile_jmespath('x.y[-1]')
+        self.assertEqual(expr.get(data), 2)
+        self.assertIs(expr.get({}, default), default)
+
+        get = jo.path.getter('x.y[0]', 'auto')
+        self.assertIs(get.__self__, jo.path.compile_jmespath('x.y[0]'))
+        self.assertEqual(get(data), 1)
+        self.assertIs(jo.path.getter('x.w', 'default')(data), jo.utils.NULL)
+
+        class Foo(jo.Schema):
+            a = jo.IntegerField(['x.a', 'x.y.1'])
+            b = jo.IntegerField(['x.b', 'x.y[-1]'], dialect='jmespath')
+            c = jo.IntegerField('x.c', required=False, default=3)
+
+        for parse in [Foo().parse, Foo().compiled]:
+            self.assertEqual(parse(data), {'a': 2, 'b': 2, 'c': 3})
+
     def test_limit_validators(self):
         limit = 5
         max_value = jo.MaxValue(limit)
@@ -281,6 +369,89 @@ class JsonObjectsTestCase(unittest.TestCase):
         self.assertEqual(f({'x': '2015-03-13 12:00:00'}), t)
         self.assertRaises(jo.ValidationError, f, {'x': 1})
 
+    def test_iso_8601_dates(self):
+        parse = dates.parse_iso_8601
+        utc = dates.fixed_timezone(datetime.timedelta(0))
+        self.assertEqual(parse('2015-03-13'), datetime.datetime(2015, 3, 13))
+        self.assertEqual(parse('2015-03-13 12:00:01.5'),
+                         datetime.datetime(2015, 3, 13, 12, 0, 1, 500000))
+        self.assertEqual(parse('2015-03-13T12:00Z'),
+                         datetime.datetime(2015, 3, 13, 12, tzinfo=utc))
+        self.assertEqual(parse('2015-03-13T12:00:00-08:00'),
+                         datetime.datetime(2015, 3, 13, 20, tzinfo=utc))
+        self.assertIs(parse('2015-03-13T12:00+0530').tzinfo,
+                      parse('2015-03-14T12:00:00+05:30').tzinfo)
+        self.assertIsNone(parse('March 13 2015'))
+        self.assertRaises(ValueError, parse, '2015-02-30')
+
+        value = parse('2015-03-13T12:00:00+05:30')
+        self.assertEqual(pickle.loads(pickle.dumps(value)), value)
+
+        f = jo.DateTimeField('x')
+        self.assertEqual(f({'x': 'March 13 2015'}),
+                         datetime.datetime(2015, 3, 13))
+        self.assertRaises(jo.ValidationError, f, {'x': '2015-02-30'})
+
+    def test_date_formats_memoization(self):
+        # Formats are tried in order unless memoization is enabled
+        f = jo.DateField('x', formats=['%m/%d/%Y', '%d/%m/%Y'])
+        self.assertEqual(f({'x': '01/02/2020'}), datetime.date(2020, 1, 2))
+        self.assertEqual(f({'x': '13/02/2020'}), datetime.date(2020, 2, 13))
+        self.assertEqual(f({'x': '01/02/2020'}), datetime.date(2020, 1, 2))
+        self.assertEqual(f._format_index, 0)
+
+        f = jo.DateField('x', formats=['%Y-%m-%d', '%d.%m.%Y', '%m/%d/%Y'],
+                         memoize_format=True)
+        self.assertEqual(f({'x': '13.03.2015'}), datetime.date(2015, 3, 13))
+        self.assertEqual(f._format_index, 1)
+        self.assertEqual(f({'x': '14.03.2015'}), datetime.date(2015, 3, 14))
+        self.assertEqual(f({'x': '2015-03-15'}), datetime.date(2015, 3, 15))
+        self.assertEqual(f._format_index, 0)
+        self.assertEqual(f({'x': '03/16/2015'}), datetime.date(2015, 3, 16))
+        self.assertEqual(f._format_index, 2)
+        self.assertRaises(jo.ValidationError, f, {'x': '2015'})
+
+    def test_cached_conversions(self):
+        f = jo.StringField('x', cache_size=2, max_length=4)
+        first = f({'x': ' USD '})
+        self.assertEqual(first, 'USD')
+        self.assertIs(f({'x': ' USD '}), first)
+        self.assertEqual(f({'x': 1}), '1')
+        self.assertEqual(f({'x': True}), 'True')
+        self.assertRaises(jo.ValidationError, f, {'x': 'EUROS'})
+        info = f.conversions.info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize),
+                         (1, 4, 2, 2))
+        self.assertEqual(f({'x': ' USD '}), 'USD')
+        self.assertEqual(f.conversions.info().misses, 5)
+
+        f = jo.DateField('x', cache_size=10)
+        self.assertIs(f({'x': '2015-03-13'}), f({'x': '2015-03-13'}))
+        self.assertRaises(AssertionError, jo.ListField, cache_size=10)
+
+        class Foo(jo.Schema):
+            tags = jo.ListField(child=jo.StringField(cache_size=10))
+            flag = jo.BooleanField(cache_size=10)
+
+        s = Foo()
+        docs = [{'tags': ['a', 'b', 'a'], 'flag': 'yes'}] * 2
+        self.assertEqual(s.parse_many(docs),
+                         [{'tags': ['a', 'b', 'a'], 'flag': True}] * 2)
+        self.assertEqual(s.parse_many(docs), [s.parse(d) for d in docs])
+        info = s.fields['tags'].child.conversions.info()
+        self.assertEqual((info.hits, info.misses), (16, 2))
+
+        f = jo.DecimalField('x', cache_size=10)
+        self.assertEqual(str(f({'x': decimal.Decimal('1.10')})), '1.10')
+        self.assertEqual(str(f({'x': decimal.Decimal('1.100')})), '1.100')
+
+        f = jo.DateTimeField('x', cache_size=10)
+        utc = dates.fixed_timezone(datetime.timedelta(0))
+        cet = dates.fixed_timezone(datetime.timedelta(hours=1))
+        for value in [datetime.datetime(2015, 3, 13, 12, tzinfo=utc),
+                      datetime.datetime(2015, 3, 13, 13, tzinfo=cet)]:
+            self.assertEqual(f({'x': value}).utcoffset(), value.utcoffset())
+
     def test_regex_field(self):
         f = jo.RegexField('x', r'^[0-9]+$', flags=re.I)
         self.assertEqual(f({'x': '123'}), '123')
@@ -309,6 +480,73 @@ class JsonObjectsTestCase(unittest.TestCase):
         f = jo.ListField('x', child=jo.IntegerField(min_value=5))
         self.assertRaises(jo.ValidationError, f, {'x': [1, 5]})
 
+    @unittest.skipIf(columns.numpy is None, '`numpy` is not installed.')
+    def test_numeric_array_field(self):
+        f = jo.NumericArrayField(min_value=0, max_value=10, precision=1,
+                                 blank=True)
+        value = f.run_validation([1, 2.25, '3.5', True])
+        self.assertEqual(value.dtype, columns.numpy.float64)
+        self.assertEqual(value.tolist(), [1.0, 2.2, 3.5, 1.0])
+        self.assertEqual(f.run_validation([]).tolist(), [])
+
+        with self.assertRaises(jo.ValidationError) as e:
+            f.run_validation([1, None, 'a', 2])
+        self.assertEqual(e.exception.messages,
+                         ['A valid number is required at indexes: 1, 2.'])
+        with self.assertRaises(jo.ValidationError) as e:
+            f.run_validation([-1] + [5] * 20)
+        self.assertEqual(e.exception.messages, [
+            'Ensure items are greater than or equal to 0 at indexes: 0.'])
+        with self.assertRaises(jo.ValidationError) as e:
+            f.run_validation([5] * 20 + [11] * 12)
+        self.assertEqual(e.exception.messages, [
+            'Ensure items are less than or equal to 10 at indexes: '
+            '20, 21, 22, 23, 24, 25, 26, 27, 28, 29 and 2 more.'])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation([[1, 2], [3, 4]])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation({'a': 1})
+
+        f = jo.NumericArrayField(dtype='int32')
+        value = f.run_validation([1, 2.0, '3'])
+        self.assertEqual(value.dtype, columns.numpy.int32)
+        self.assertEqual(value.tolist(), [1, 2, 3])
+        with self.assertRaises(jo.ValidationError) as e:
+            f.run_validation([1, 2.5, float('inf')])
+        self.assertEqual(e.exception.messages,
+                         ['A valid number is required at indexes: 1, 2.'])
+        for items in [[1, 2 ** 31], [1, -2 ** 31 - 1.0], [1, '3e9'],
+                      [1, 2 ** 70], [1, -10 ** 400]]:
+            with self.assertRaises(jo.ValidationError) as e:
+                f.run_validation(items)
+            self.assertEqual(e.exception.messages,
+                             ['A valid number is required at indexes: 1.'])
+        value = f.run_validation([2 ** 31 - 1, -2 ** 31 + 0.0])
+        self.assertEqual(value.tolist(), [2 ** 31 - 1, -2 ** 31])
+
+        f = jo.NumericArrayField(dtype='int64')
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation([2 ** 70])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation([2.0 ** 63])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation(columns.numpy.array([2 ** 63], dtype='uint64'))
+        self.assertEqual(f.run_validation([2 ** 63 - 1]).tolist(),
+                         [2 ** 63 - 1])
+
+        f = jo.NumericArrayField(dtype='uint8', max_value=200)
+        self.assertEqual(f.run_validation([0, 200.0]).tolist(), [0, 200])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation([-1])
+        with self.assertRaises(jo.ValidationError):
+            f.run_validation([256])
+
+        f = jo.NumericArrayField(min_value=0, max_value=10)
+        with self.assertRaises(jo.ValidationError) as e:
+            f.run_validation([1, float('nan')])
+        self.assertEqual(e.exception.messages, [
+            'Ensure items are less than or equal to 10 at indexes: 1.'])
+
     def test_dict_field(self):
         f = jo.DictField('x')
         self.assertEqual(f({'x': {'y': {}, 'z': None}}), {'y': {}, 'z': None})
@@ -376,6 +614,40 @@ class JsonObjectsTestCase(unittest.TestCase):
         self.assertEqual(f1(data), {'y': [{'x': 1}, {'x': 2}]})
         self.assertEqual(f2(data), {'z': {'1': {'x': 1}, '2': {'x': 2}}})
 
+    def test_schema_shared_fields(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        class Bar(jo.Schema):
+            foos = jo.ListField(child=Foo())
+
+        a, b = Bar('a'), Bar('b')
+        self.assertEqual(a({'a': {'foos': [{'x': 1}]}}), {'foos': [{'x': 1}]})
+        self.assertEqual(b({'b': {'foos': [{'x': 2}]}}), {'foos': [{'x': 2}]})
+        # Compiled sources are shared, the fields are not
+        a_foo, b_foo = a.fields['foos'].child, b.fields['foos'].child
+        self.assertIs(a_foo.fields['x']._getters, b_foo.fields['x']._getters)
+        self.assertIsNot(a_foo.fields['x'], b_foo.fields['x'])
+        self.assertIs(a_foo.parent, a.fields['foos'])
+        self.assertIs(a_foo.fields['x'].parent, a_foo)
+
+        a_foo.fields['x'].required = False
+        a_foo.fields['x'].default = None
+        a_foo.fields['x'].validators.append(jo.MaxValue(5))
+        self.assertEqual(a({'a': {'foos': [{'y': 1}]}}),
+                         {'foos': [{'x': None}]})
+        self.assertRaises(jo.ValidationError, a, {'a': {'foos': [{'x': 6}]}})
+        self.assertRaises(jo.ValidationError, b, {'b': {'foos': [{'y': 1}]}})
+        self.assertEqual(b({'b': {'foos': [{'x': 6}]}}), {'foos': [{'x': 6}]})
+        self.assertTrue(Bar().fields['foos'].child.fields['x'].required)
+        self.assertEqual(Foo().fields['x'].validators, [])
+
+        # Prototypes kept by the class don't keep instances alive
+        ref = weakref.ref(a)
+        del a, a_foo
+        gc.collect()
+        self.assertIsNone(ref())
+
     def test_schema_inheritance(self):
 
         class Foo(jo.Schema):
@@ -408,6 +680,702 @@ class JsonObjectsTestCase(unittest.TestCase):
                 ]}
             ])
 
+    def test_schema_record(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        class Bar(jo.Schema):
+            y = jo.StringField()
+            foo = Foo()
+            foos = jo.ListField(child=Foo())
+            plain = Foo(record=False)
+
+        s = Bar(record=True)
+        data = {'y': 'a', 'foo': {'x': 1}, 'foos': [{'x': '2'}],
+                'plain': {'x': 3}}
+        for parse in [s.parse, s.compile()]:
+            result = parse(data)
+            self.assertEqual(type(result).__name__, 'BarRecord')
+            self.assertEqual(result.y, 'a')
+            self.assertEqual(result['y'], 'a')
+            self.assertEqual(result.foo.x, 1)
+            self.assertEqual(result.foos[0].x, 2)
+            self.assertEqual(result.plain, {'x': 3})
+            self.assertFalse(hasattr(result, '__dict__'))
+            self.assertEqual(sorted(result._asdict()),
+                             ['foo', 'foos', 'plain', 'y'])
+            self.assertEqual(repr(result.foo), 'FooRecord(x=1)')
+
+        self.assertEqual(s.parse(data), s.compile()(data))
+        self.assertNotEqual(s.parse(data), s.parse(dict(data, y='b')))
+        self.assertEqual(pickle.loads(pickle.dumps(s.parse(data))),
+                         s.parse(data))
+        self.assertEqual(s.parse_many([data], workers=2), [s.parse(data)])
+        self.assertEqual(Bar().parse(data)['foo'], {'x': 1})
+
+    def test_schema_lazy(self):
+        calls = []
+
+        class Foo(jo.Schema):
+            x = jo.IntegerField(post_process=lambda v: calls.append(v) or v)
+            y = jo.IntegerField()
+
+            def validate_y(self, value):
+                return value * 2
+
+        class Bar(jo.Schema):
+            foo = Foo()
+            z = jo.StringField(required=False, default='z')
+
+        s = Bar(lazy=True)
+        data = {'foo': {'x': 1, 'y': 'a'}}
+        for parse in [s.parse, s.compile()]:
+            del calls[:]
+            result = parse(data)
+            self.assertIsInstance(result, jo.LazyRecord)
+            self.assertEqual(calls, [])
+            self.assertEqual(result.z, 'z')
+            self.assertEqual(result['foo'].x, 1)
+            self.assertEqual(result['foo']['x'], 1)
+            self.assertEqual(calls, [1])
+            with self.assertRaises(jo.ValidationError) as e:
+                result.foo.y
+            self.assertEqual(e.exception.flatten_messages,
+                             {'foo': [{'y': ['A valid integer is required.']}]})
+            with self.assertRaises(jo.ValidationError) as e:
+                result.validate_all()
+            self.assertEqual(e.exception.flatten_messages, [
+                {'foo': [{'y': ['A valid integer is required.']}]}])
+            with self.assertRaises(AttributeError):
+                result.missing
+
+        result = s.parse({'foo': {'x': 1, 'y': 2}})
+        self.assertEqual(result.validate_all(),
+                         {'foo': {'x': 1, 'y': 4}, 'z': 'z'})
+        self.assertEqual(sorted(result), ['foo', 'z'])
+        self.assertEqual(pickle.loads(pickle.dumps(result)),
+                         {'foo': {'x': 1, 'y': 4}, 'z': 'z'})
+        self.assertEqual(Bar().parse({'foo': {'x': 1, 'y': 2}}),
+                         {'foo': {'x': 1, 'y': 4}, 'z': 'z'})
+
+        with self.assertRaises(jo.ValidationError):
+            s.parse({})
+
+    def test_schema_compile(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField(min_value=1)
+            y = jo.ListField(child=jo.StringField(), required=False,
+                             default=list)
+            z = jo.DictField(child=jo.FloatField(precision=1), blank=True)
+
+            def validate_x(self, value):
+                return value * 10
+
+        for s in [ItemSchema(), DetailsSchema('details'),
+                  Foo(result_factory=sorted)]:
+            parse = s.compile()
+            self.assertIsNotNone(parse.source)
+
+        s = ItemSchema()
+        self.assertEqual(s.compile()(TEST_INPUT), s(TEST_INPUT))
+
+        s = Foo('foo')
+        parse = s.compile()
+        for data in [{'foo': {'x': 1, 'y': [u' a ', 'b'], 'z': {'a': 1.25}}},
+                     {'foo': {'x': u'2', 'z': {}}}]:
+            self.assertEqual(parse(data), s(data))
+
+        for data in [{}, {'foo': None}, {'foo': {}},
+                     {'foo': {'x': 0, 'y': [None], 'z': []}},
+                     {'foo': {'x': 'a', 'y': 1, 'z': {'a': 'b'}}}]:
+            with self.assertRaises(jo.ValidationError) as expected:
+                s(data)
+            with self.assertRaises(jo.ValidationError) as actual:
+                parse(data)
+            self.assertEqual(repr(actual.exception), repr(expected.exception))
+
+    def test_schema_compile_is_null(self):
+        class NullableString(jo.StringField):
+            def is_null(self, value):
+                return value in (None, 'N/A')
+
+        class NullableInteger(jo.IntegerField):
+            def is_null(self, value):
+                return value in (None, -1)
+
+        class Foo(jo.Schema):
+            name = NullableString(null=True)
+            count = NullableInteger(null=True)
+
+        data = {'name': 'N/A', 'count': -1}
+        for s in [Foo(), Foo(trusted=True)]:
+            self.assertEqual(s.parse(data), {'name': None, 'count': None})
+            self.assertEqual(s.compiled(data), {'name': None, 'count': None})
+            self.assertEqual(s.parse_many([data]), [s.compiled(data)])
+            self.assertEqual(s.compiled({'name': 'a', 'count': 2}),
+                             {'name': 'a', 'count': 2})
+
+    def test_schema_compile_shared_prefixes(self):
+        class Foo(jo.Schema):
+            n = jo.IntegerField()
+
+        class Bar(jo.Schema):
+            a = jo.IntegerField('meta.publisher.id')
+            b = jo.StringField('meta.publisher.name', null=True)
+            c = jo.StringField(['meta.publisher.url', 'meta.url'])
+            d = jo.Field('meta.publisher', required=False, default=None)
+            e = jo.Field('meta.x', required=False, default=None)
+            foo = Foo('meta.publisher.foo')
+
+        s = Bar()
+        compiled = s.compile()
+        self.assertEqual(compiled.source.count("d.get('publisher', NULL)"), 1)
+
+        doc = {'meta': {'publisher': {'id': 1, 'name': 'x',
+                                      'foo': {'n': 2}},
+                        'url': 'u'}}
+        self.assertEqual(compiled(doc), s.parse(doc))
+        self.assertEqual(compiled(doc)['c'], 'u')
+        for doc in [{'meta': {'publisher': None}}, {'meta': []}, {}]:
+            with self.assertRaises(jo.ValidationError) as e1:
+                s.parse(doc)
+            with self.assertRaises(jo.ValidationError) as e2:
+                compiled(doc)
+            self.assertEqual(e1.exception.flatten_messages,
+                             e2.exception.flatten_messages)
+
+    def test_schema_adaptive_sources(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField(['a', 'b', 'c'], adaptive=True,
+                                required=False, default=None)
+
+        s = Foo()
+        self.assertEqual(s.parse_many([{'b': i} for i in range(120)]),
+                         [{'x': i} for i in range(120)])
+        # Declared priority is kept after reordering
+        self.assertEqual(s.parse({'a': 1, 'b': 2}), {'x': 1})
+        self.assertEqual(s.compiled({'a': 1, 'b': 2, 'c': 3}), {'x': 1})
+        self.assertEqual(s.compiled({'c': 3}), {'x': 3})
+        self.assertEqual(s.parse({'d': 4}), {'x': None})
+        info = s.fields['x'].source_stats.info()
+        self.assertEqual(info.order, ['b', 'a', 'c'])
+        self.assertEqual(info.hits, {'a': 2, 'b': 120, 'c': 1})
+        self.assertEqual(info.misses, 1)
+
+        class Bar(jo.Schema):
+            x = jo.IntegerField(['a.x', 'b.x', 'c'], dialect='jmespath',
+                                adaptive=True)
+
+        s = Bar()
+        s.parse_many([{'c': i} for i in range(100)])
+        stats = s.fields['x'].source_stats
+        self.assertEqual(stats.info().order, ['c', 'a.x', 'b.x'])
+        self.assertEqual(stats.roots, ['a', 'b', 'c'])
+        for parse in [s.parse, s.compiled]:
+            self.assertEqual(parse({'b': {'x': 2}, 'c': 3}), {'x': 2})
+            self.assertEqual(parse({'a': {}, 'b': {'x': 2}, 'c': 3}),
+                             {'x': 2})
+
+        roots = [jo.path._root_key(jo.path.getter(src, 'jmespath'))
+                 for src in ['a[0].b', 'a[*].b', 'a[?b]', 'a | [0]',
+                             'a || b', 'length(a)']]
+        self.assertEqual(roots, ['a', 'a', 'a', None, None, None])
+
+    def test_schema_max_errors(self):
+        class Bar(jo.Schema):
+            a = jo.IntegerField()
+            b = jo.IntegerField()
+
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+            y = jo.DateField()
+            z = jo.IntegerField(min_value=0)
+            bar = Bar()
+
+        data = {'x': 'a', 'y': 'b', 'z': -1, 'bar': {'a': 'a', 'b': 'b'}}
+        for kwargs, count, nested in [({}, 4, 2), ({'max_errors': 2}, 2, 2),
+                                      ({'fail_fast': True}, 1, 1)]:
+            s = Foo(**kwargs)
+            self.assertEqual(s.fields['bar'].errors_limit,
+                             kwargs and count or None)
+            lazy = Foo(lazy=True, **kwargs)
+            for parse in [s.parse, s.compiled,
+                          lambda d: lazy.parse(d).validate_all()]:
+                with self.assertRaises(jo.ValidationError) as e:
+                    parse(data)
+                self.assertEqual(len(e.exception.messages), count)
+
+            with self.assertRaises(jo.ValidationError) as e:
+                s.parse(dict(data, x=1, y='2015-03-13', z=1))
+            self.assertEqual(len(e.exception.messages[0].messages), nested)
+
+    def test_lazy_error_messages(self):
+        e = jo.ValidationError('Ensure {limit} > {value}.', 'x',
+                               {'limit': 1, 'value': 0})
+        wrapped = e.with_field_name('y')
+        self.assertIsNotNone(wrapped.params)
+        self.assertEqual(wrapped.messages, ['Ensure 1 > 0.'])
+        self.assertIsNone(wrapped.params)
+        self.assertEqual(pickle.loads(pickle.dumps(e)).messages,
+                         ['Ensure 1 > 0.'])
+        self.assertEqual(jo.ValidationError('{x}').messages, ['{x}'])
+
+        f = jo.DateField('x', formats=['%Y-%m-%d', '%d.%m.%Y'])
+        with self.assertRaises(jo.ValidationError) as e:
+            f({'x': 'a'})
+        self.assertEqual(e.exception.messages, [
+            "A valid date is required. Allowed formats: "
+            "'%Y-%m-%d', '%d.%m.%Y'."])
+
+    def test_schema_trusted(self):
+        class Bar(jo.Schema):
+            a = jo.IntegerField(max_value=10)
+
+        class Foo(jo.Schema):
+            x = jo.StringField(max_length=3)
+            y = jo.FloatField(precision=1)
+            z = jo.DecimalField()
+            d = jo.DateTimeField()
+            bars = jo.ListField(child=Bar())
+
+        now = datetime.datetime(2015, 3, 13, 12)
+        data = {'x': 'abc', 'y': 1.24, 'z': decimal.Decimal('1.5'),
+                'd': now, 'bars': [{'a': 1}]}
+        invalid = dict(data, x='abcd', bars=[{'a': 11}])
+        s = Foo(trusted=True)
+        # Values are not validated, but still normalized
+        self.assertEqual(s.parse(data), dict(data, y=1.2))
+        self.assertEqual(s.parse(dict(data, x=u' ab ', y=1.26)),
+                         dict(data, x='ab', y=1.3))
+        self.assertEqual(s.parse(data), Foo().parse(data))
+        self.assertEqual(s.parse(invalid)['bars'], [{'a': 11}])
+        self.assertEqual(s.parse_many([invalid]), [s.parse(invalid)])
+        self.assertIsNone(s.trust_info())
+        # Other types are converted as usual
+        self.assertEqual(s.parse(dict(data, y=1, z=2, d='2015-03-13T12:00')),
+                         dict(data, y=1.0, z=decimal.Decimal(2)))
+        self.assertRaises(jo.ValidationError, s.parse, dict(data, y='a'))
+
+        s = Foo(trusted=True, validate_fraction=1.0)
+        self.assertEqual(s.parse(data), dict(data, y=1.2))
+        with self.assertRaises(jo.ValidationError) as e:
+            s.parse(invalid)
+        self.assertEqual(len(e.exception.messages), 2)
+        self.assertEqual(s.trust_info(), (2, 2, 1))
+
+        s = Foo(trusted=True, validate_fraction=0.5)
+        s.parse_many([invalid] * 100, on_error='skip')
+        info = s.trust_info()
+        self.assertEqual(info.documents, 100)
+        self.assertEqual(info.violations, info.sampled)
+        self.assertTrue(0 < info.sampled < 100)
+
+        # Documents parsed differently by the trusted parser are violations
+        class Baz(jo.Schema):
+            x = jo.IntegerField(post_process=lambda x: next(counter))
+
+        counter = iter(range(10))
+        s = Baz(trusted=True, validate_fraction=1.0)
+        self.assertEqual(s.parse({'x': 1}), {'x': 0})
+        self.assertEqual(s.trust_info(), (1, 1, 1))
+
+    def test_schema_parse_many(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        s = Foo()
+        data = [{'x': 1}, {'x': 'a'}, {'x': '3'}, {'y': 1}]
+        self.assertEqual(s.parse_many(data[::2]), [{'x': 1}, {'x': 3}])
+        self.assertEqual(s.parse_many(data, on_error='skip'),
+                         [{'x': 1}, {'x': 3}])
+
+        results, errors = s.parse_many(iter(data), on_error='collect')
+        self.assertEqual(results, [{'x': 1}, {'x': 3}])
+        self.assertEqual([i for i, _ in errors], [1, 3])
+        self.assertEqual(errors[1][1].flatten_messages,
+                         [{'x': ['This field is required.']}])
+
+        with self.assertRaises(jo.ValidationError) as e:
+            s.parse_many(data)
+        self.assertEqual(e.exception.index, 1)
+        self.assertRaises(AssertionError, s.parse_many, data, 'ignore')
+
+    def test_schema_parse_columns(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+            y = jo.FloatField(required=False, default=None, null=True)
+            z = jo.BooleanField(required=False, default=False)
+            s = jo.StringField(post_process=len)
+            d = jo.DecimalField(required=False, default=None)
+
+        s = Foo()
+        data = [{'x': i, 'y': i / 2.0 if i % 3 else None, 'z': i % 2,
+                 's': 'a' * i, 'd': '1.5'} for i in range(1, 21)]
+        data.insert(5, {'x': 'a', 's': 'b'})
+
+        columns, errors = s.parse_columns(data, 'collect')
+        self.assertEqual([(i, e.index) for i, e in errors], [(5, 5)])
+        self.assertEqual(len(columns), 20)
+        self.assertEqual(sorted(columns), ['d', 's', 'x', 'y', 'z'])
+        self.assertEqual(list(columns.rows()),
+                         s.parse_many(data[:5] + data[6:]))
+
+        x = columns['x']
+        self.assertEqual(x.typecode, 'q' if sys.version_info >= (3, 3)
+                         else 'l')
+        self.assertEqual(x.to_list(), list(range(1, 21)))
+        self.assertEqual(columns['y'].null_count, 6)
+        self.assertEqual(columns['y'][2], None)
+        self.assertEqual(columns['y'].values[2], 0)
+        self.assertEqual(columns['y'][-1], 10.0)
+        self.assertEqual(columns['z'].to_list()[:3], [True, False, True])
+        # Post processors change type of values
+        self.assertEqual(columns['s'].typecode, None)
+        self.assertEqual(columns['s'][19], 20)
+        self.assertEqual(columns['d'].to_list(), [decimal.Decimal('1.5')] * 20)
+
+        with self.assertRaises(jo.ValidationError) as e:
+            s.parse_columns(data)
+        self.assertEqual(e.exception.index, 5)
+
+    @unittest.skipIf(columns.numpy is None, '`numpy` is not installed.')
+    def test_schema_parse_columns_numpy(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+            y = jo.FloatField(required=False, default=None)
+
+        arrays = Foo().parse_columns(
+            [{'x': 1, 'y': 0.5}, {'x': 2, 'y': None}]).to_numpy()
+        self.assertEqual(arrays['x'].tolist(), [1, 2])
+        self.assertEqual(arrays['y'].tolist(), [0.5, None])
+
+        class Bar(jo.Schema):
+            v = jo.NumericArrayField(required=False, default=None)
+
+        data = [{'v': [1, 2]}, {'v': [3, 4]}] * 8 + [{}]
+        cols = Bar().parse_columns(data)
+        self.assertEqual([v.tolist() for v in cols['v'].to_list()[:2]],
+                         [[1.0, 2.0], [3.0, 4.0]])
+        self.assertIsNone(cols['v'][-1])
+        values = cols.to_numpy()['v']
+        self.assertEqual(values.shape, (17,))
+        self.assertEqual(values[1].tolist(), [3.0, 4.0])
+        self.assertTrue(values.mask[-1])
+
+    def test_schema_parse_many_workers(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField(post_process=lambda x: -x)
+
+        s = Foo()
+        data = [{'x': i} for i in range(100)] + [{'x': 'a'}, {'x': 1}]
+        results, errors = s.parse_many(data, 'collect', workers=2,
+                                       chunk_size=7)
+        self.assertEqual(results, [{'x': -i} for i in range(100)] +
+                         [{'x': -1}])
+        self.assertEqual([i for i, _ in errors], [100])
+        self.assertEqual(errors[0][1].flatten_messages,
+                         [{'x': ['A valid integer is required.']}])
+
+        pool = s.create_pool(2)
+        try:
+            self.assertEqual(
+                s.parse_many(data, 'skip', executor=pool, chunk_size=10),
+                results)
+            with self.assertRaises(jo.ValidationError) as e:
+                s.parse_many(data, executor=pool)
+            self.assertEqual(e.exception.index, 100)
+        finally:
+            pool.terminate()
+
+    @unittest.skipIf(not hasattr(multiprocessing, 'get_context'),
+                     'start methods are not supported')
+    def test_schema_spawn_workers(self):
+        self.assertIs(pickle.loads(pickle.dumps(jo.NULL)), jo.NULL)
+
+        s = WorkerSchema()
+        data = [{'x': i} for i in range(20)]
+        expected = [{'x': i, 'y': None} for i in range(20)]
+        # Compiled parsers are not pickled
+        self.assertEqual(s.parse_many(data), expected)
+        pool = s.create_pool(2, multiprocessing.get_context('spawn'))
+        try:
+            self.assertEqual(s.parse_many(data, executor=pool), expected)
+
+            fd, path = tempfile.mkstemp()
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(b'{"x": 1}\n{"x": 2, "y": 3}\n')
+                self.assertEqual(s.parse_shards(path, shards=2, executor=pool),
+                                 [{'x': 1, 'y': None}, {'x': 2, 'y': 3}])
+            finally:
+                os.remove(path)
+        finally:
+            pool.terminate()
+
+    def test_schema_iter_parse_lines(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        s = Foo()
+        data = b'{"x": 1}\n\n{"x": "a"}\n{"x": \n{"x": 3}'
+        self.assertEqual(
+            list(s.iter_parse_lines(io.BytesIO(data), 'skip', chunk_size=4)),
+            [{'x': 1}, {'x': 3}])
+
+        results = list(s.iter_parse_lines(io.BytesIO(data), 'collect'))
+        self.assertEqual(results[0], {'x': 1})
+        self.assertEqual([(e.index, e.line, e.offset) for e in results[1:3]],
+                         [(1, 3, 10), (2, 4, 21)])
+
+        with self.assertRaises(jo.ValidationError) as e:
+            list(s.iter_parse_lines(io.BytesIO(data)))
+        self.assertEqual(e.exception.line, 3)
+
+        data = b'a\n\n' + b'b' * 50 + b'\n c\n\nd'
+        expected = [(1, 0, b'a'), (3, 3, b'b' * 50), (4, 54, b' c'),
+                    (6, 58, b'd')]
+        for chunk_size in [1, 3, 7, 100]:
+            self.assertEqual(
+                list(iter_lines(io.BytesIO(data), chunk_size)), expected)
+
+    def test_schema_parse_shards(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        s = Foo()
+        data = b'{"x": 1}\n\n{"x": "a"}\n{"x": \n{"x": 3}\n' * 3
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+
+            expected = list(s.iter_parse_lines(io.BytesIO(data), 'collect'))
+            for shards in [1, 2, 5, 100]:
+                results, errors = s.parse_shards(
+                    path, workers=1, on_error='collect', shards=shards)
+                self.assertEqual(results, [{'x': 1}, {'x': 3}] * 3)
+                self.assertEqual(
+                    [(i, e.index, e.line, e.offset) for i, e in errors],
+                    [(e.index, e.index, e.line, e.offset)
+                     for e in expected if isinstance(e, jo.ValidationError)])
+
+            shards = list(s.iter_parse_shards(
+                path, workers=2, shards=3, ordered=False, on_error='skip'))
+            self.assertEqual(sorted(shard.index for shard in shards), [0, 1, 2])
+            self.assertEqual(sum(len(shard.results) for shard in shards), 6)
+            self.assertFalse(any(shard.errors for shard in shards))
+
+            with self.assertRaises(jo.ValidationError) as e:
+                s.parse_shards(path, workers=2)
+            self.assertEqual((e.exception.line, e.exception.offset), (3, 10))
+        finally:
+            os.remove(path)
+
+    def test_schema_iter_parse_array(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField()
+
+        s = Foo()
+        data = (b'{"count": 3, "skip": {"a": [1, "]}\\"", {}]}, '
+                b'"results": [{"x": 1, "y": [{}, "["]}, {"x": "a"},'
+                b' {"x": 30000} ], "tail": null}')
+        for chunk_size in [1, 2, 7, 1024]:
+            stream = io.BytesIO(data)
+            self.assertEqual(
+                list(s.iter_parse_array(stream, 'results', 'skip',
+                                        chunk_size=chunk_size)),
+                [{'x': 1}, {'x': 30000}])
+
+        self.assertEqual(list(s.iter_parse_array(b'[{"x": 1}]')), [{'x': 1}])
+        self.assertEqual(list(s.iter_parse_array(b' [ ] ')), [])
+        self.assertEqual(
+            list(s.iter_parse_array(b'{"a": [[], [{"x": 2}]]}', 'a.1')),
+            [{'x': 2}])
+
+        with self.assertRaises(jo.ValidationError) as e:
+            list(s.iter_parse_array(data, 'results'))
+        self.assertEqual(e.exception.index, 1)
+        self.assertRaises(jo.NotFound, list,
+                          s.iter_parse_array(data, 'count.x'))
+        self.assertRaises(jo.NotFound, list,
+                          s.iter_parse_array(data, 'missing'))
+        self.assertRaises(jo.GenericError, list,
+                          s.iter_parse_array(b'{"results": [{"x": 1}, {"x"'))
+
+    def test_stream_chunk_boundaries(self):
+        ALL = jo.stream.ALL
+        data = (b'{"skip": 12.5, "a": {"price": 12.5e-1, "n": -30}, '
+                b'"b": [1.25, 2E+3], "c": 7}')
+        projection = {'a': {'price': ALL}, 'b': ALL, 'c': ALL}
+        expected = {'a': {'price': 1.25}, 'b': [1.25, 2000.0], 'c': 7}
+        # Every offset of the document is a chunk boundary for some size
+        for chunk_size in range(1, len(data) + 1):
+            self.assertEqual(
+                jo.stream.load(io.BytesIO(data), projection,
+                               chunk_size=chunk_size), expected)
+            self.assertEqual(
+                jo.stream.load(io.BytesIO(data), chunk_size=chunk_size),
+                dict(expected, skip=12.5, a={'price': 1.25, 'n': -30}))
+            self.assertEqual(
+                list(jo.stream.iter_array(io.BytesIO(data), 'b',
+                                          chunk_size=chunk_size)),
+                [1.25, 2000.0])
+
+    def test_schema_projection(self):
+        ALL, ANY = jo.stream.ALL, jo.stream.ANY
+
+        class Foo(jo.Schema):
+            x = jo.IntegerField('a.x')
+            y = jo.ListField('a.y', child=jo.DictField(child=jo.Field()))
+            z = jo.Field(['a.0.z', 'b.?.z'], required=False, default=None)
+
+        class Bar(jo.Schema):
+            foo = Foo('foo')
+            foos = jo.ListField('foos', child=Foo(), required=False,
+                                default=list)
+            any = jo.Field('c[0]', required=False, default=None)
+
+        self.assertEqual(Foo().projection, {
+            'a': {'x': ALL, 'y': ALL, 'z': ALL},
+            'b': {ANY: {'z': ALL}},
+        })
+        self.assertIs(Bar().projection, ALL)
+        self.assertEqual(Foo('data').projection, {'data': Foo().projection})
+
+        s = Foo('data')
+        data = (u'{"data": {"a": {"x": "1", "y": [{"1": {"d": [2]}}], '
+                u'"w": [{"q": [1, {"r": "\\"]"}]}], "z": {"k": [1]}}, '
+                u'"b": {"1": {"z": 3, "w": 4}}, "c": "\u0439"}, "x": 5}')
+        self.assertEqual(jo.stream.loads(data, s.projection), {
+            'data': {'a': {'x': '1', 'y': [{'1': {'d': [2]}}],
+                           'z': {'k': [1]}},
+                     'b': {'1': {'z': 3}}}
+        })
+        for d in [data, data.encode('utf-8')]:
+            self.assertEqual(s.parse_json(d, project=True), s.parse_json(d))
+
+        # Objects with skipped keys are still not blank
+        self.assertEqual(jo.stream.loads('{"a": {"w": 1}}', {'a': {}}),
+                         {'a': {'w': None}})
+        self.assertRaises(jo.GenericError, s.parse_json, data[:-1], True)
+
+    def test_schema_projection_fallbacks(self):
+        ALL, ANY = jo.stream.ALL, jo.stream.ANY
+
+        class First(jo.Field):
+            def find(self, data):
+                return data['b'][0]
+
+        class Pairs(jo.ListField):
+            def convert_to_type(self, value):
+                return [sorted(v.items()) for v in value]
+
+        class Foo(jo.Schema):
+            x = jo.IntegerField('a.x')
+
+        class Bar(Foo):
+            def convert_to_type(self, value):
+                return dict(super(Bar, self).convert_to_type(value),
+                            keys=sorted(value))
+
+        class Qux(Foo):
+            y = First()
+
+        class Quux(Foo):
+            y = Pairs('p', child=Foo())
+
+        class Baz(jo.Schema):
+            z = jo.Field('b.?.z')
+            w = jo.Field('b.k.w')
+
+        # Overridden lookups and conversions see the data as is
+        self.assertIs(Qux().projection, ALL)
+        self.assertEqual(Quux().projection, {'a': {'x': ALL}, 'p': ALL})
+        self.assertIs(Bar().projection, ALL)
+        data = u'{"a": {"x": 1}, "b": [2], "p": [{"a": {"x": 3}, "y": 4}]}'
+        for s in [Qux(), Quux(), Bar()]:
+            self.assertEqual(s.parse_json(data, project=True),
+                             s.parse_json(data))
+
+        # Keys matched by `?` are merged into the projections of the keys
+        self.assertEqual(Baz().projection, {
+            'b': {ANY: {'z': ALL}, 'k': {'z': ALL, 'w': ALL}},
+        })
+        data = u'{"b": {"k": {"z": 1, "w": 2, "v": 3}}}'
+        self.assertEqual(Baz().parse_json(data, project=True),
+                         {'z': 1, 'w': 2})
+
+    def test_schema_parse_json(self):
+        class Foo(jo.Schema):
+            x = jo.IntegerField('a.x')
+            y = jo.FloatField(required=False, default=None)
+
+        class Bar(Foo):
+            z = jo.DecimalField()
+
+        s = Foo()
+        data = b'{"a": {"x": "1"}, "y": 0.1}'
+        for d in [data, data.decode('utf-8'), bytearray(data),
+                  memoryview(data)]:
+            self.assertEqual(s.parse_json(d), {'x': 1, 'y': 0.1})
+        self.assertEqual(s.parse_json(data, decoder='json'),
+                         {'x': 1, 'y': 0.1})
+        self.assertRaises(jo.GenericError, s.parse_json, data, decoder='x')
+        self.assertRaises(jo.ValidationError, s.parse_json, data[:-1])
+        # Documents accepted by `json` are accepted by any default decoder
+        for d in [b'{"a": {"x": 1}, "y": -Infinity}',
+                  b'{"a": {"x": 1}, "y": 1e400}']:
+            self.assertEqual(s.parse_json(d), s.parse_json(d, decoder='json'))
+
+        def reject(data, use_decimal=False):
+            raise ValueError('Unexpected character.')
+
+        loads = decoders._FallbackLoads(reject)
+        self.assertEqual(loads(b'[Infinity]'), [float('inf')])
+        self.assertRaises(ValueError, loads, b'[')
+        self.assertRaises(jo.ValidationError, s.parse_json, data[:-1],
+                          project=True)
+
+        s = Bar()
+        self.assertFalse(Foo().use_decimal)
+        self.assertTrue(s.use_decimal)
+        data = b'{"a": {"x": 1.0}, "y": 0.1, "z": 0.1}'
+        self.assertEqual(s.parse_json(data),
+                         {'x': 1, 'y': 0.1, 'z': decimal.Decimal('0.1')})
+
+        # Other fields get floats of the document as decimals too
+        class Baz(Bar):
+            w = jo.Field()
+            v = jo.StringField()
+
+        result = Baz().parse_json(
+            b'{"a": {"x": 1e2}, "y": 0.1, "z": 0.1, "w": 0.5, "v": 1e2}')
+        self.assertEqual(result['x'], 100)
+        self.assertIs(type(result['y']), float)
+        self.assertEqual(result['w'], decimal.Decimal('0.5'))
+        self.assertEqual(result['v'], '1E+2')
+        self.assertEqual(
+            Baz().parse_json(b'{"a": {"x": 1e2}, "y": 0.1, "z": 0.1, '
+                             b'"w": 0.5, "v": 1e2}', use_decimal=False),
+            dict(result, z=decimal.Decimal(0.1), w=0.5, v='100.0'))
+        with self.assertRaises(jo.ValidationError) as e:
+            Baz().parse_json(b'{"a": {"x": 1.5}, "y": 0.1, "z": 0.1, '
+                             b'"w": 0, "v": "a"}')
+        self.assertEqual(e.exception.flatten_messages,
+                         [{'x': ['A valid integer is required.']}])
+        self.assertEqual(s.parse_json(data, project=True), s.parse_json(data))
+
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            self.assertEqual(s.parse_file(path), s.parse_json(data))
+            with open(path, 'rb') as f:
+                self.assertEqual(s.parse_file(f, project=True),
+                                 s.parse_json(data))
+        finally:
+            os.remove(path)
+
 
 if __name__ == '__main__':
     unittest.main()
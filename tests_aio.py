@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests of asyncio support, which requires Python 3.6+ syntax."""
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import jsonobjects as jo
+
+
+class Foo(jo.Schema):
+    x = jo.IntegerField()
+
+
+class AsyncioTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_aparse(self):
+        s = Foo()
+        self.assertEqual(self.run_async(s.aparse({'x': '1'})), {'x': 1})
+
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(self.run_async(s.aparse({'x': 2}, executor)),
+                             {'x': 2})
+
+        pool = s.create_pool(2)
+        try:
+            self.assertEqual(self.run_async(s.aparse({'x': 3}, pool)),
+                             {'x': 3})
+            with self.assertRaises(jo.ValidationError):
+                self.run_async(s.aparse({'x': 'a'}, pool))
+        finally:
+            pool.terminate()
+
+    def test_as_decorator(self):
+        s = Foo()
+
+        @s.as_decorator
+        async def fetch(x):
+            await asyncio.sleep(0)
+            return {'x': x}
+
+        self.assertTrue(asyncio.iscoroutinefunction(fetch))
+        self.assertEqual(self.run_async(fetch('1')), {'x': 1})
+        with self.assertRaises(jo.ValidationError):
+            self.run_async(fetch('a'))
+
+    def test_async_hooks(self):
+        running = []
+        calls = []
+
+        async def lookup(value):
+            running.append(value)
+            calls.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(value)
+            if value < 0:
+                raise jo.ValidationError('Unknown.')
+            return value * 10
+
+        async def check(value):
+            await asyncio.sleep(0)
+
+        class Bar(jo.Schema):
+            x = jo.IntegerField(post_process=[lookup, str])
+            y = jo.ListField(child=jo.IntegerField(post_process=lookup))
+            z = jo.IntegerField(validators=check)
+
+            async def validate_z(self, value):
+                return await lookup(value)
+
+        s = Bar()
+        self.assertTrue(s.is_async)
+        self.assertFalse(Foo().is_async)
+
+        data = {'x': 1, 'y': [2, 3, 4], 'z': 5}
+        expected = {'x': '10', 'y': [20, 30, 40], 'z': 50}
+        self.assertEqual(self.run_async(s.aparse(data)), expected)
+        self.assertEqual(max(calls), 5)
+
+        del calls[:]
+        self.assertEqual(self.run_async(s.aparse(data, concurrency=2)),
+                         expected)
+        self.assertEqual(max(calls), 2)
+
+        with self.assertRaises(jo.ValidationError) as e:
+            self.run_async(s.aparse({'x': -1, 'y': [1, -2], 'z': 'a'}))
+        self.assertEqual(
+            sorted(e.exception.flatten_messages, key=lambda m: list(m)),
+            [{'x': ['Unknown.']}, {'y': ['Unknown.']},
+             {'z': ['A valid integer is required.']}])
+
+        with self.assertRaises(AssertionError):
+            s.parse_many([data])
+        with self.assertRaises(AssertionError):
+            s.parse(data)
+        with self.assertRaises(AssertionError):
+            s.as_decorator(lambda: data)()
+        with self.assertRaises(AssertionError):
+            s.fields['y']({'y': [1]})
+
+    def test_aiter_parse_lines(self):
+        s = Foo()
+
+        async def parse(on_error):
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"x": 1}\n\n{"x": "a"}\n{"x": \n')
+            reader.feed_data(b'{"x": 3}')
+            reader.feed_eof()
+            return [r async for r in s.aiter_parse_lines(reader, on_error)]
+
+        self.assertEqual(self.run_async(parse('skip')), [{'x': 1}, {'x': 3}])
+
+        results = self.run_async(parse('collect'))
+        self.assertEqual([(e.index, e.line, e.offset) for e in results[1:3]],
+                         [(1, 3, 10), (2, 4, 21)])
+
+        with self.assertRaises(jo.ValidationError) as e:
+            self.run_async(parse('raise'))
+        self.assertEqual(e.exception.line, 3)
+
+    def test_aiter_parse_long_lines(self):
+        s = Foo()
+        line = b'{"x": 1, "y": "' + b'a' * 100 + b'"}\n'
+
+        async def parse(data):
+            # Lines are longer than the limit of the reader
+            reader = asyncio.StreamReader(limit=16)
+            reader.feed_data(data)
+            reader.feed_eof()
+            return [r async for r in s.aiter_parse_lines(reader, 'collect')]
+
+        results = self.run_async(parse(line + b'{"x": "a"}\n' + line[:-1]))
+        self.assertEqual(results[0], {'x': 1})
+        self.assertEqual(results[1].line, 2)
+        self.assertEqual(results[2], {'x': 1})
+        self.assertEqual(self.run_async(parse(b'{"x": 2}' + b' ' * 40)),
+                         [{'x': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()